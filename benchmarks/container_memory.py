@@ -0,0 +1,63 @@
+"""
+Measures memory used by containers with thousands of providers.
+
+Run with installed package: python benchmarks/container_memory.py
+To compare layouts, run it with each version of the package on the same Python.
+"""
+
+import tracemalloc
+from typing import Any, Dict, Type
+
+from injection import DeclarativeContainer, providers
+
+CONTAINERS = 10
+PROVIDERS_PER_CONTAINER = 1_000
+
+
+class Settings:
+    def __init__(self, url: str = "sqlite://") -> None:
+        self.url = url
+
+
+class Service:
+    def __init__(self, *dependencies: Any, **options: Any) -> None:
+        self.dependencies = dependencies
+        self.options = options
+
+
+def _build_container(index: int) -> Type[DeclarativeContainer]:
+    settings = providers.Singleton(Settings)
+    attributes: Dict[str, Any] = {"settings": settings}
+
+    for number in range(PROVIDERS_PER_CONTAINER):
+        previous = attributes[f"service_{number - 1}"] if number else settings
+        attributes[f"service_{number}"] = providers.Factory(
+            Service,
+            previous,
+            url=settings.provided.url,
+            number=number,
+        )
+
+    return type(f"GeneratedContainer{index}", (DeclarativeContainer,), attributes)
+
+
+def main() -> None:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    containers = [_build_container(index) for index in range(CONTAINERS)]
+
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    providers_count = sum(len(container.get_providers()) for container in containers)
+    used = after - before
+    print(  # noqa: T201
+        f"{providers_count} providers: {used / 1024:.0f} KiB, "
+        f"{used / providers_count:.0f} bytes per provider, "
+        f"peak: {(peak - before) / 1024:.0f} KiB",
+    )
+
+
+if __name__ == "__main__":
+    main()
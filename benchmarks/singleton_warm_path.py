@@ -0,0 +1,68 @@
+"""
+Compares resolving of already created Singleton and initialized Resource
+with the unsynchronized resolving, which was used before locks were added.
+
+Run with installed package: python benchmarks/singleton_warm_path.py
+"""
+
+import timeit
+from typing import Any, Callable, Iterator, List, Tuple, TypeVar, cast
+
+from injection import providers
+from injection.providers.base import BaseProvider
+from injection.providers.base_factory import BaseFactoryProvider
+
+T = TypeVar("T")
+
+NUMBER = 1_000_000
+REPEAT = 5
+
+
+class UnlockedSingleton(providers.Singleton[T]):
+    def _resolve(self, *args: Any, **kwargs: Any) -> T:
+        if self._instance is None:
+            self._instance = BaseFactoryProvider._resolve(self, *args, **kwargs)
+        return self._instance
+
+
+class UnlockedResource(providers.Resource[T]):
+    def _resolve(self) -> T:
+        state = self._get_state()
+
+        if state.initialized:
+            return cast(T, state.instance)
+
+        state.context = self._get_plan().resolve((), {})
+        state.instance = state.context.__enter__()
+        state.initialized = True
+        return cast(T, state.instance)
+
+
+def _resource() -> Iterator[object]:
+    yield object()
+
+
+def _measure(provider: Callable[[], Any]) -> float:
+    provider()
+    timings = timeit.repeat(provider, number=NUMBER, repeat=REPEAT)
+    return min(timings) / NUMBER * 1e9
+
+
+def main() -> None:
+    cases: List[Tuple[str, BaseProvider[Any], BaseProvider[Any]]] = [
+        ("Singleton", providers.Singleton(object), UnlockedSingleton(object)),
+        ("Resource", providers.Resource(_resource), UnlockedResource(_resource)),
+    ]
+
+    for name, provider, unlocked_provider in cases:
+        locked = _measure(provider)
+        unlocked = _measure(unlocked_provider)
+        print(  # noqa: T201
+            f"{name}: {locked:.1f} ns per call, "
+            f"without lock: {unlocked:.1f} ns per call, "
+            f"ratio: {locked / unlocked:.2f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from injection.auto_inject import auto_inject
 from injection.base_container import DeclarativeContainer
 from injection.inject import inject
 from injection.provide import Provide
+from injection.scope import request_scope, resolution_session
 
 __all__ = [
     "DeclarativeContainer",
@@ -12,4 +13,6 @@ __all__ = [
     "auto_inject",
     "inject",
     "providers",
+    "request_scope",
+    "resolution_session",
 ]
@@ -1,16 +1,39 @@
 import inspect
 import sys
-from functools import wraps
-from typing import Any, Callable, Coroutine, Dict, Optional, Type, TypeVar, Union, cast
+from functools import partial, wraps
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from injection.base_container import DeclarativeContainer
+from injection.exceptions import (
+    DuplicatedFactoryTypeAutoInjectionError,
+    UnknownProviderTypeAutoInjectionError,
+)
 from injection.inject import (
-    close_related_function_scope_resources_async,
-    close_related_function_scope_resources_sync,
+    FunctionScopeResources,
+    InjectKwargsAsync,
+    InjectKwargsSync,
+    get_function_scope_resources,
+    get_injection_position,
+    get_parameters_type_hints,
+    is_async_resolvable,
+    run_injected_async,
+    run_injected_sync,
 )
 from injection.provide import Provide
-from injection.providers.base import BaseProvider
-from injection.providers.base_factory import BaseFactoryProvider
+from injection.providers.base import NOT_RESOLVED, BaseProvider
+from injection.scope import get_resolution_session, resolution_session
 
 if sys.version_info < (3, 10):
     from typing_extensions import ParamSpec
@@ -23,110 +46,230 @@ Markers = Dict[str, Provide]
 _ContainerType = Union[Type[DeclarativeContainer], DeclarativeContainer]
 
 
-def _get_sync_injected(
-    *,
-    f: Callable[P, T],
+# (position, parameter name, provider, parameter type, provider should be resolved with await),
+# provider is None when it was not found by type, then lookup is repeated on call to raise error
+AutoInjectionEntry = Tuple[int, str, Optional[BaseProvider[Any]], Any, bool]
+AutoInjectionPlan = Tuple[AutoInjectionEntry, ...]
+
+
+def _get_auto_injection_entry(
+    position: int,
+    parameter: inspect.Parameter,
+    annotation: Any,
+    target_container: _ContainerType,
+) -> Optional[AutoInjectionEntry]:
+    provider: Optional[BaseProvider[Any]] = None
+
+    if isinstance(parameter.default, Provide):
+        provider = parameter.default.provider
+    elif annotation is not parameter.empty and parameter.default is parameter.empty:
+        try:
+            provider = target_container.get_provider_by_type(annotation)
+        except (
+            DuplicatedFactoryTypeAutoInjectionError,
+            UnknownProviderTypeAutoInjectionError,
+        ):
+            provider = None
+    else:
+        return None
+
+    return (
+        get_injection_position(parameter, position),
+        parameter.name,
+        provider,
+        annotation,
+        provider is not None and is_async_resolvable(provider),
+    )
+
+
+def get_auto_injection_plan(
+    f: Callable[..., Any],
     signature: inspect.Signature,
     target_container: _ContainerType,
-) -> Callable[P, T]:
-    @wraps(f)
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        providers = []
+) -> AutoInjectionPlan:
+    """Resolves providers for parameters by their types"""
+    type_hints = get_parameters_type_hints(f, signature)
+    plan = []
+
+    for position, parameter in enumerate(signature.parameters.values()):
+        annotation = type_hints.get(parameter.name, parameter.annotation)
+        entry = _get_auto_injection_entry(
+            position,
+            parameter,
+            annotation,
+            target_container,
+        )
+
+        if entry is not None:
+            plan.append(entry)
 
-        for i, (param_name, param) in enumerate(signature.parameters.items()):
-            if i < len(args) or param_name in kwargs:
-                continue
+    return tuple(plan)
 
-            value_or_provide: Union[Provide, Any] = kwargs.get(
-                param_name,
-                param.default,
+
+def _inject_kwargs_sync(
+    plan: AutoInjectionPlan,
+    target_container: _ContainerType,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    *,
+    in_session: bool,
+) -> Optional[List[BaseProvider[Any]]]:
+    """Returns providers found after the plan was built, they are not in precomputed set"""
+    if in_session and get_resolution_session() is None:
+        with resolution_session():
+            return _inject_kwargs_sync(
+                plan,
+                target_container,
+                args,
+                kwargs,
+                in_session=False,
             )
-            provider: Optional[BaseProvider[Any]] = None
 
-            if isinstance(value_or_provide, Provide):
-                provider = value_or_provide.provider
+    found_providers: Optional[List[BaseProvider[Any]]] = None
+    args_count = len(args)
+
+    for position, param_name, found_provider, type_, _ in plan:
+        if position < args_count or param_name in kwargs:
+            continue
+
+        provider = found_provider
+
+        if provider is None:
+            # Raises lookup error
+            provider = target_container.get_provider_by_type(type_)
+            found_providers = found_providers or []
+            found_providers.append(provider)
+
+        kwargs[param_name] = provider()
+
+    return found_providers
 
-            is_parameter_for_autoinject = (
-                param.annotation is not param.empty and param.default is param.empty
+
+async def _inject_kwargs_async(
+    plan: AutoInjectionPlan,
+    target_container: _ContainerType,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    *,
+    in_session: bool,
+) -> Optional[List[BaseProvider[Any]]]:
+    """Returns providers found after the plan was built, they are not in precomputed set"""
+    if in_session and get_resolution_session() is None:
+        with resolution_session():
+            return await _inject_kwargs_async(
+                plan,
+                target_container,
+                args,
+                kwargs,
+                in_session=False,
             )
 
-            if is_parameter_for_autoinject:
-                provider = target_container.get_provider_by_type(param.annotation)
+    found_providers: Optional[List[BaseProvider[Any]]] = None
+    args_count = len(args)
+
+    for position, param_name, found_provider, type_, async_mode in plan:
+        if position < args_count or param_name in kwargs:
+            continue
+
+        provider = found_provider
+        should_await = async_mode
+
+        if provider is None:
+            # Raises lookup error
+            provider = target_container.get_provider_by_type(type_)
+            should_await = is_async_resolvable(provider)
+            found_providers = found_providers or []
+            found_providers.append(provider)
+
+        if should_await:
+            # Created objects are returned without coroutines
+            value = provider._peek()
 
-            if provider is None:
-                continue
+            if value is NOT_RESOLVED:
+                value = await provider.async_resolve()
 
-            providers.append(provider)
+            kwargs[param_name] = value
+        else:
             kwargs[param_name] = provider()
 
-        try:
-            result = f(*args, **kwargs)
-        finally:
-            close_related_function_scope_resources_sync(providers)
-        return result
+    return found_providers
 
-    return wrapper
 
+def _get_function_scope_resources(plan: AutoInjectionPlan) -> FunctionScopeResources:
+    return get_function_scope_resources(
+        provider for _, _, provider, _, _ in plan if provider is not None
+    )
 
-def _get_async_injected(
+
+def _get_sync_injected(
     *,
-    f: Callable[P, Coroutine[Any, Any, T]],
+    f: Callable[P, T],
     signature: inspect.Signature,
     target_container: _ContainerType,
-) -> Callable[P, Coroutine[Any, Any, T]]:
-    @wraps(f)
-    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        providers = []
-
-        for i, (param_name, param) in enumerate(signature.parameters.items()):
-            if i < len(args) or param_name in kwargs:
-                continue
-
-            value_or_provide = kwargs.get(param_name, param.default)
-            provider: Optional[BaseProvider[Any]] = None
+    in_session: bool,
+) -> Callable[P, T]:
+    # Built on the first call, so forward references can be resolved
+    inject_kwargs: Optional[InjectKwargsSync] = None
+    resources: FunctionScopeResources = ()
 
-            is_parameter_for_autoinject = (
-                param.annotation is not param.empty and param.default is param.empty
+    @wraps(f)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        nonlocal inject_kwargs, resources
+
+        if inject_kwargs is None:
+            plan = get_auto_injection_plan(f, signature, target_container)
+            resources = _get_function_scope_resources(plan)
+            inject_kwargs = partial(
+                _inject_kwargs_sync,
+                plan,
+                target_container,
+                in_session=in_session,
             )
 
-            if is_parameter_for_autoinject:
-                provider = target_container.get_provider_by_type(param.annotation)
-            elif isinstance(value_or_provide, Provide):
-                provider = value_or_provide.provider
-
-            if provider is None:
-                continue
+        return run_injected_sync(f, inject_kwargs, resources, args, kwargs)
 
-            providers.append(provider)
-
-            resolved = False
-            resolved_provide = None
+    return wrapper
 
-            if (
-                isinstance(provider, BaseFactoryProvider)
-                and provider.should_be_async_resolved
-            ):
-                resolved_provide = await provider.async_resolve()
-                resolved = True
 
-            if not resolved:
-                resolved_provide = provider()
+def _get_async_injected(
+    *,
+    f: Callable[P, Coroutine[Any, Any, T]],
+    signature: inspect.Signature,
+    target_container: _ContainerType,
+    in_session: bool,
+) -> Callable[P, Coroutine[Any, Any, T]]:
+    # Built on the first call, so forward references can be resolved
+    inject_kwargs: Optional[InjectKwargsAsync] = None
+    resources: FunctionScopeResources = ()
 
-            kwargs[param_name] = resolved_provide
+    @wraps(f)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        nonlocal inject_kwargs, resources
+
+        if inject_kwargs is None:
+            plan = get_auto_injection_plan(f, signature, target_container)
+            resources = _get_function_scope_resources(plan)
+            inject_kwargs = partial(
+                _inject_kwargs_async,
+                plan,
+                target_container,
+                in_session=in_session,
+            )
 
-        try:
-            result = await f(*args, **kwargs)
-        finally:
-            await close_related_function_scope_resources_async(providers)
-        return result
+        return await run_injected_async(f, inject_kwargs, resources, args, kwargs)
 
     return wrapper
 
 
 def auto_inject(
     target_container: Optional[_ContainerType] = None,
+    *,
+    resolution_session: bool = False,
 ) -> Callable[[Callable[P, T]], Callable[P, T]]:
-    """Decorate callable with injecting decorator. Inject objects by types"""
+    """
+    Decorate callable with injecting decorator. Inject objects by types.
+    With resolution session providers shared by injected objects are resolved once per call.
+    """
 
     def wrapper(f: Callable[P, T]) -> Callable[P, T]:
         nonlocal target_container
@@ -150,6 +293,7 @@ def auto_inject(
                 f=f,
                 signature=signature,
                 target_container=target_container,
+                in_session=resolution_session,
             )
             return cast(Callable[P, T], func_with_injected_params)
         else:
@@ -157,6 +301,7 @@ def auto_inject(
                 f=f,
                 signature=signature,
                 target_container=target_container,
+                in_session=resolution_session,
             )
 
     return wrapper
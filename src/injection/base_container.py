@@ -1,23 +1,217 @@
 import asyncio
+import collections.abc
+import contextlib
 import inspect
-from collections import defaultdict
-from contextlib import contextmanager
-from typing import Any, Callable, Dict, Iterator, List, Optional, Type, TypeVar, cast
+from abc import ABC, ABCMeta
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_type_hints,
+)
+
+import typing_extensions
+from typing_extensions import Annotated, get_args, get_origin
 
+from injection.compiler import compile_providers
 from injection.exceptions import (
     DuplicatedFactoryTypeAutoInjectionError,
     UnknownProviderTypeAutoInjectionError,
 )
+from injection.lifecycle import (
+    ScheduleReport,
+    WarmupReport,
+    schedule_async,
+    shutdown_async,
+    warmup,
+    warmup_async,
+)
 from injection.providers import Resource, Singleton
 from injection.providers.base import BaseProvider
 from injection.providers.base_factory import BaseFactoryProvider
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+_DUPLICATED = object()
+_UNKNOWN = object()
+_TypeIndex = Dict[Any, Union[BaseFactoryProvider[Any], object]]
+
+# Types from MRO which are too common to find a provider by them
+_NOT_INDEXED_TYPES = {
+    object,
+    ABC,
+    Generic,
+    Protocol,
+    typing_extensions.Protocol,
+    typing_extensions.Generic,
+}
+
+# Bases from these modules are too general, e.g. str of class Kind(str, Enum),
+# so they are indexed only when they are declared types of the provider
+_NOT_INHERITED_MODULES = {"builtins", "enum"}
+
+# Origins of return annotations wrapping the provided object: origin -> argument position
+_WRAPPER_ORIGINS = {
+    collections.abc.Iterator: 0,
+    collections.abc.Iterable: 0,
+    collections.abc.Generator: 0,
+    collections.abc.AsyncIterator: 0,
+    collections.abc.AsyncIterable: 0,
+    collections.abc.AsyncGenerator: 0,
+    collections.abc.Awaitable: 0,
+    collections.abc.Coroutine: 2,
+    contextlib.AbstractContextManager: 0,
+    contextlib.AbstractAsyncContextManager: 0,
+}
+
+
+def _unwrap_return_type(annotation: Any) -> Any:
+    while True:
+        position = _WRAPPER_ORIGINS.get(get_origin(annotation))
+
+        if position is None:
+            return annotation
+
+        args = get_args(annotation)
+
+        if len(args) <= position:
+            return None
+
+        annotation = args[position]
+
+
+def _get_return_type(factory: Callable[..., Any]) -> Any:
+    while isinstance(factory, partial):
+        factory = factory.func
+
+    try:
+        hints = get_type_hints(inspect.unwrap(factory))
+    except Exception:  # annotations may be unresolvable, so skip them
+        return None
+
+    return _unwrap_return_type(hints.get("return"))
+
+
+def _get_index_keys(provider: BaseFactoryProvider[Any]) -> Tuple[List[Any], List[Any]]:
+    """Returns direct types of the provider and types inherited by them"""
+    direct_keys = [provider.factory, *provider.interfaces]
+
+    if not inspect.isclass(provider.factory):
+        return_type = _get_return_type(provider.factory)
+
+        if return_type is not None:
+            direct_keys.append(return_type)
+
+    inherited_keys = [
+        base
+        for key in direct_keys
+        if inspect.isclass(key)
+        for base in inspect.getmro(key)[1:]
+        if base.__module__ not in _NOT_INHERITED_MODULES
+    ]
+    return direct_keys, inherited_keys
+
+
+def _add_index_candidate(
+    candidates: Dict[Any, List[BaseFactoryProvider[Any]]],
+    key: Any,
+    provider: BaseFactoryProvider[Any],
+) -> None:
+    try:
+        if key in _NOT_INDEXED_TYPES:
+            return
+        providers = candidates.setdefault(key, [])
+    except TypeError:  # unhashable annotation
+        return
+
+    if provider not in providers:
+        providers.append(provider)
 
-class DeclarativeContainer:
+
+def _select_candidate(providers: List[BaseFactoryProvider[Any]]) -> object:
+    return providers[0] if len(providers) == 1 else _DUPLICATED
+
+
+class ProviderRegistry:
+    """Providers of the container grouped by kind, built on changes of the container"""
+
+    __slots__ = ("by_name", "factories", "providers", "resources", "singletons")
+
+    def __init__(self, by_name: Dict[str, BaseProvider[Any]]) -> None:
+        self.by_name = by_name
+        self.providers: Tuple[BaseProvider[Any], ...] = tuple(by_name.values())
+        self.singletons: Tuple[Singleton[Any], ...] = tuple(
+            provider for provider in self.providers if isinstance(provider, Singleton)
+        )
+        self.resources: Tuple[Resource[Any], ...] = tuple(
+            provider for provider in self.providers if isinstance(provider, Resource)
+        )
+        self.factories: Tuple[BaseFactoryProvider[Any], ...] = tuple(
+            provider
+            for provider in self.providers
+            if isinstance(provider, BaseFactoryProvider)
+        )
+
+
+def _collect_providers(container: type) -> Dict[str, BaseProvider[Any]]:
+    """Providers declared in the container and its bases, subclasses take priority"""
+    providers: Dict[str, BaseProvider[Any]] = {}
+
+    for base in reversed(container.__mro__):
+        for name, value in vars(base).items():
+            if isinstance(value, BaseProvider):
+                providers[name] = value
+            else:
+                # Attribute of subclass hides provider of the base
+                providers.pop(name, None)
+
+    # Same order as members of the class have
+    return dict(sorted(providers.items()))
+
+
+class _DeclarativeContainerMeta(ABCMeta):
+    """
+    Registers providers again when providers are added or removed.
+    Based on ABCMeta, so containers can be abstract with ABC as another base.
+    """
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        # Provider could be declared in the base container
+        replaces_provider = name in cls._get_providers()  # type: ignore[attr-defined]
+        super().__setattr__(name, value)
+
+        if replaces_provider or isinstance(value, BaseProvider):
+            cls._register_providers()  # type: ignore[attr-defined]
+
+    def __delattr__(cls, name: str) -> None:
+        removes_provider = name in cls._get_providers()  # type: ignore[attr-defined]
+        super().__delattr__(name)
+
+        # Provider of the base container could be hidden by removed attribute
+        if removes_provider or isinstance(getattr(cls, name, None), BaseProvider):
+            cls._register_providers()  # type: ignore[attr-defined]
+
+
+class DeclarativeContainer(metaclass=_DeclarativeContainerMeta):
     __instance: Optional["DeclarativeContainer"] = None
-    __providers: Optional[Dict[str, BaseProvider[Any]]] = None
+    __registry: ProviderRegistry = ProviderRegistry({})
+    __type_index: Optional[_TypeIndex] = None
+    __compiled: bool = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._register_providers()
 
     @classmethod
     def instance(cls) -> "DeclarativeContainer":
@@ -25,27 +219,31 @@ class DeclarativeContainer:
             cls.__instance = cls()
         return cls.__instance
 
+    @classmethod
+    def _register_providers(cls) -> None:
+        """Registry and type index of subclasses are built again too"""
+        cls.__registry = ProviderRegistry(_collect_providers(cls))
+        cls.__type_index = None
+
+        for subclass in cls.__subclasses__():
+            subclass._register_providers()
+
+    @classmethod
+    def get_registry(cls) -> ProviderRegistry:
+        """Precomputed tuples of providers, they are not copied on each call"""
+        return cls.__registry
+
     @classmethod
     def _get_providers(cls) -> Dict[str, BaseProvider[Any]]:
-        if cls.__providers is None:
-            cls.__providers = {
-                member_name: member
-                for member_name, member in inspect.getmembers(cls)
-                if isinstance(member, BaseProvider)
-            }
-        return cls.__providers
+        return cls.__registry.by_name
 
     @classmethod
     def get_providers(cls) -> List[BaseProvider[Any]]:
-        return list(cls._get_providers().values())
+        return list(cls.__registry.providers)
 
     @classmethod
     def get_resource_providers(cls) -> List[Resource[Any]]:
-        return [
-            provider
-            for provider in cls.get_providers()
-            if isinstance(provider, Resource)
-        ]
+        return list(cls.__registry.resources)
 
     @classmethod
     @contextmanager
@@ -53,11 +251,13 @@ class DeclarativeContainer:
         cls,
         *,
         reset_singletons: bool = False,
+        local: bool = False,
         **providers_for_overriding: Any,
     ) -> Iterator[None]:
         with cls.override_providers(
             providers_for_overriding,
             reset_singletons=reset_singletons,
+            local=local,
         ):
             yield
 
@@ -68,7 +268,12 @@ class DeclarativeContainer:
         providers_for_overriding: Dict[str, Any],
         *,
         reset_singletons: bool = False,
+        local: bool = False,
     ) -> Iterator[None]:
+        """
+        Local overrides are visible only in the current context (task or thread),
+        so tests with them can run concurrently.
+        """
         current_providers = cls._get_providers()
         current_provider_names = set(current_providers.keys())
         given_provider_names = set(providers_for_overriding.keys())
@@ -82,63 +287,173 @@ class DeclarativeContainer:
         if reset_singletons:
             cls.reset_singletons()
 
-        for provider_name, mock in providers_for_overriding.items():
-            provider = current_providers[provider_name]
-            provider.override(mock)
+        if local:
+            with ExitStack() as stack:
+                for provider_name, mock in providers_for_overriding.items():
+                    provider = current_providers[provider_name]
+                    stack.enter_context(provider.override_context(mock, local=True))
 
-        yield
+                yield
+        else:
+            for provider_name, mock in providers_for_overriding.items():
+                provider = current_providers[provider_name]
+                provider.override(mock)
 
-        for provider_name in providers_for_overriding:
-            provider = current_providers[provider_name]
-            provider.reset_override()
+            yield
+
+            for provider_name in providers_for_overriding:
+                provider = current_providers[provider_name]
+                provider.reset_override()
 
         # Reset singletons that which were resolved INSIDE the current context
         if reset_singletons:
             cls.reset_singletons()
 
+        # Overriding drops compiled resolvers, so restore them
+        if cls.__compiled:
+            cls.compile()
+
     @classmethod
     def reset_singletons(cls) -> None:
-        providers_gen = cls.get_providers()
-
-        for provider in providers_gen:
-            if isinstance(provider, Singleton):
-                provider.reset()
+        for provider in cls.__registry.singletons:
+            provider.reset()
 
     @classmethod
     def reset_override(cls) -> None:
-        for provider in cls.get_providers():
+        for provider in cls.__registry.providers:
             provider.reset_override()
 
     @classmethod
-    def get_provider_by_type(cls, type_: Type[Any]) -> BaseProvider[Any]:
-        provider_factory_to_providers = defaultdict(list)
+    def compile(cls) -> None:
+        """
+        Generates specialized resolving functions for Factory, Transient and Singleton
+        providers of the container. Calls of child providers are inlined,
+        so object is built by one flat function.
+        Overridden providers fall back to the regular resolving,
+        call this method again after resetting of overriding.
+        """
+        compile_providers(cls.__registry.factories)
+        cls.__compiled = True
+
+    @classmethod
+    def _build_type_index(cls) -> _TypeIndex:
+        """
+        Maps types to providers: factory, return annotation of the factory
+        (unwrapped from Iterator, AsyncIterator, Awaitable and etc.), declared interfaces
+        and base classes of all of them. Direct types have the priority over base classes.
+        """
+        direct_candidates: Dict[Any, List[BaseFactoryProvider[Any]]] = {}
+        inherited_candidates: Dict[Any, List[BaseFactoryProvider[Any]]] = {}
+
+        for provider in cls.__registry.factories:
+            direct_keys, inherited_keys = _get_index_keys(provider)
+
+            for key in direct_keys:
+                _add_index_candidate(direct_candidates, key, provider)
+
+            for key in inherited_keys:
+                _add_index_candidate(inherited_candidates, key, provider)
+
+        index: _TypeIndex = {
+            key: _select_candidate(providers)
+            for key, providers in inherited_candidates.items()
+        }
+        index.update(
+            (key, _select_candidate(providers))
+            for key, providers in direct_candidates.items()
+        )
+        return index
+
+    @staticmethod
+    def _match_type(index: _TypeIndex, type_: Any) -> object:
+        """Finds provider for type which is not indexed directly"""
+        if get_origin(type_) is Annotated:
+            inner_type = get_args(type_)[0]
+            return index.get(inner_type) or DeclarativeContainer._match_type(
+                index,
+                inner_type,
+            )
 
-        for provider in cls.get_providers():
-            if not issubclass(type(provider), BaseFactoryProvider):
+        if not getattr(type_, "_is_runtime_protocol", False):
+            return _UNKNOWN
+
+        matched: List[Any] = []
+
+        for key, provider in list(index.items()):
+            if not isinstance(provider, BaseFactoryProvider) or provider in matched:
                 continue
 
-            provider_factory_to_providers[provider.factory].append(provider)  # type: ignore
+            with contextlib.suppress(TypeError):
+                if inspect.isclass(key) and issubclass(key, type_):
+                    matched.append(provider)
 
-            if len(provider_factory_to_providers[provider.factory]) > 1:  # type: ignore
-                raise DuplicatedFactoryTypeAutoInjectionError(str(type_))
+        return _select_candidate(matched) if matched else _UNKNOWN
 
-        for providers in provider_factory_to_providers.values():
-            provider = providers[0]
-            provider = cast(BaseFactoryProvider[Any], provider)
+    @classmethod
+    def _get_type_index(cls) -> _TypeIndex:
+        index = cls.__type_index
 
-            if type_ is provider.factory:
-                return provider
+        if index is None:
+            index = cls.__type_index = cls._build_type_index()
 
-        raise UnknownProviderTypeAutoInjectionError(str(type_))
+        return index
+
+    @classmethod
+    def get_provider_by_type(cls, type_: Type[Any]) -> BaseProvider[Any]:
+        index = cls._get_type_index()
+
+        try:
+            provider = index.get(type_)
+        except TypeError:  # unhashable annotation
+            raise UnknownProviderTypeAutoInjectionError(str(type_)) from None
+
+        if provider is None:
+            # Result of the lookup is cached, including misses
+            provider = index[type_] = cls._match_type(index, type_)
+
+        if provider is _UNKNOWN:
+            raise UnknownProviderTypeAutoInjectionError(str(type_))
+
+        if provider is _DUPLICATED:
+            raise DuplicatedFactoryTypeAutoInjectionError(str(type_))
+
+        return provider  # type: ignore[return-value]
 
     @classmethod
     def resolve_by_type(cls, type_: Type[Any]) -> Any:
         provider = cls.get_provider_by_type(type_)
         return provider()
 
+    @classmethod
+    def _get_warmup_providers(cls) -> Dict[str, BaseProvider[Any]]:
+        """Singletons and resources which are not bound to injected calls"""
+        return {
+            name: provider
+            for name, provider in cls.__registry.by_name.items()
+            if isinstance(provider, Singleton)
+            or (isinstance(provider, Resource) and not provider.function_scope)
+        }
+
+    @classmethod
+    def warmup(cls, *, max_workers: Optional[int] = None) -> WarmupReport:
+        """
+        Eagerly initializes singletons and resources in order of dependencies,
+        independent providers are initialized concurrently in threads.
+        Providers which require await are skipped, use warmup_async for them.
+        """
+        return warmup(cls._get_warmup_providers(), max_workers=max_workers)
+
+    @classmethod
+    async def warmup_async(cls, *, max_workers: Optional[int] = None) -> WarmupReport:
+        """
+        Same as warmup, but async providers are initialized too,
+        concurrently in the event loop.
+        """
+        return await warmup_async(cls._get_warmup_providers(), max_workers=max_workers)
+
     @classmethod
     def init_resources(cls) -> None:
-        for provider in cls.get_resource_providers():
+        for provider in cls.__registry.resources:
             if not provider.is_async_factory:
                 provider()
 
@@ -147,30 +462,38 @@ class DeclarativeContainer:
         await asyncio.gather(
             *[
                 provider.async_resolve()
-                for provider in cls.get_resource_providers()
+                for provider in cls.__registry.resources
                 if provider.should_be_async_resolved
             ],
         )
 
     @classmethod
-    async def init_all_resources(cls) -> None:
-        resource_providers = cls.get_resource_providers()
+    def _get_named_resources(cls) -> Dict[str, Resource[Any]]:
+        return {
+            name: provider
+            for name, provider in cls.__registry.by_name.items()
+            if isinstance(provider, Resource)
+        }
 
-        await asyncio.gather(
-            *[
-                provider.async_resolve()
-                for provider in resource_providers
-                if provider.should_be_async_resolved
-            ],
+    @classmethod
+    async def init_all_resources(
+        cls,
+        *,
+        max_workers: Optional[int] = 0,
+    ) -> ScheduleReport:
+        """
+        Each resource is initialized as soon as resources it depends on are ready.
+        Sync resources are initialized in the loop thread,
+        unless max_workers other than zero is passed to initialize them in threads.
+        """
+        return await schedule_async(
+            cls._get_named_resources(),
+            max_workers=max_workers,
         )
 
-        for provider in resource_providers:
-            if not provider.is_async_factory:
-                provider()
-
     @classmethod
     def close_resources(cls) -> None:
-        for provider in cls.get_resource_providers():
+        for provider in cls.__registry.resources:
             if provider.initialized and not provider.is_async_factory:
                 provider.close()
 
@@ -179,12 +502,29 @@ class DeclarativeContainer:
         await asyncio.gather(
             *[
                 provider.async_close()
-                for provider in cls.get_resource_providers()
+                for provider in cls.__registry.resources
                 if provider.initialized and provider.is_async_factory
             ],
         )
 
     @classmethod
-    async def close_all_resources(cls) -> None:
-        await cls.close_async_resources()
-        cls.close_resources()
+    async def close_all_resources(
+        cls,
+        *,
+        timeout: Optional[float] = None,
+        resource_timeout: Optional[float] = None,
+        max_workers: Optional[int] = 0,
+    ) -> None:
+        """
+        Closes resources in reverse order of dependencies, resources of the same
+        layer are closed concurrently. Sync resources are closed in the loop thread,
+        unless max_workers other than zero is passed to close them in threads.
+        Errors and timeouts of all resources are raised together
+        in ResourcesShutdownError.
+        """
+        await shutdown_async(
+            cls._get_named_resources(),
+            timeout=timeout,
+            resource_timeout=resource_timeout,
+            max_workers=max_workers,
+        )
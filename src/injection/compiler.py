@@ -0,0 +1,104 @@
+import keyword
+from typing import Any, Callable, Dict, Iterable, List, cast
+
+from injection.provided import ProvidedInstance
+from injection.providers import Factory, Object, Singleton, Transient
+from injection.providers.base import BaseProvider
+from injection.providers.base_factory import BaseFactoryProvider
+
+CompiledResolver = Callable[[], Any]
+
+
+def _is_compilable(provider: BaseProvider[Any]) -> bool:
+    return (
+        isinstance(provider, (Factory, Transient, Singleton))
+        and not provider._has_overrides()
+        and not provider.should_be_async_resolved
+    )
+
+
+class _SourceBuilder:
+    """Generates flat python source for resolving of the provider graph"""
+
+    def __init__(self) -> None:
+        self.namespace: Dict[str, Any] = {}
+        self._names: Dict[int, str] = {}
+
+    def _bind(self, prefix: str, value: Any) -> str:
+        key = id(value)
+        name = self._names.get(key)
+
+        if name is None:
+            name = f"_{prefix}{len(self.namespace)}"
+            self._names[key] = name
+            self.namespace[name] = value
+
+        return name
+
+    def _call(self, provider: BaseFactoryProvider[Any]) -> str:
+        factory = self._bind("f", provider.factory)
+        arguments: List[str] = [self.expression(arg) for arg in provider._args]
+
+        for name, value in provider._kwargs.items():
+            value_expression = self.expression(value)
+
+            if name.isidentifier() and not keyword.iskeyword(name):
+                arguments.append(f"{name}={value_expression}")
+            else:
+                arguments.append(f"**{{{name!r}: {value_expression}}}")
+
+        return f"{factory}({', '.join(arguments)})"
+
+    def _provided_expression(self, provided: ProvidedInstance) -> str:
+        if provided._getter is None:
+            return f"{self._bind('c', provided)}.get_value()"
+
+        getter = self._bind("g", provided._getter)
+        return f"{getter}({self.expression(provided._provided)})"
+
+    def _provider_expression(self, provider: BaseProvider[Any]) -> str:
+        if not provider._has_overrides():
+            if isinstance(provider, Object):
+                return self._bind("c", provider._value)
+
+            if isinstance(provider, (Factory, Transient)) and _is_compilable(provider):
+                return self._call(provider)
+
+        name = self._bind("p", provider)
+
+        if isinstance(provider, Singleton) and not provider._has_overrides():
+            return f"({name}._instance if {name}._instance is not None else {name}())"
+
+        return f"{name}()"
+
+    def expression(self, value: Any) -> str:
+        if isinstance(value, ProvidedInstance):
+            return self._provided_expression(value)
+
+        if isinstance(value, BaseProvider):
+            return self._provider_expression(value)
+
+        return self._bind("c", value)
+
+    def function(self, name: str, provider: BaseFactoryProvider[Any]) -> str:
+        return f"def {name}():\n    return {self._call(provider)}\n"
+
+
+def compile_provider(provider: BaseFactoryProvider[Any]) -> CompiledResolver:
+    """Generates a function which builds the object of the provider without
+    repacking of arguments through intermediate providers"""
+    builder = _SourceBuilder()
+    function_name = "_resolve"
+    source = builder.function(function_name, provider)
+    code = compile(source, f"<injection: {provider!r}>", "exec")
+    exec(code, builder.namespace)  # noqa: S102
+    resolver: CompiledResolver = builder.namespace[function_name]
+    resolver.__source__ = source  # type: ignore[attr-defined]
+    return resolver
+
+
+def compile_providers(providers: Iterable[BaseProvider[Any]]) -> None:
+    for provider in providers:
+        if _is_compilable(provider):
+            factory_provider = cast(BaseFactoryProvider[Any], provider)
+            factory_provider._compiled = compile_provider(factory_provider)
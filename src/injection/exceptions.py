@@ -1,3 +1,6 @@
+from typing import Dict
+
+
 class DuplicatedFactoryTypeAutoInjectionError(Exception):
     def __init__(self, type_: str) -> None:
         message = (
@@ -11,3 +14,11 @@ class UnknownProviderTypeAutoInjectionError(Exception):
     def __init__(self, type_: str) -> None:
         message = f"Provider with type {type_!r} not found"
         super().__init__(message)
+
+
+class ResourcesShutdownError(Exception):
+    def __init__(self, errors: Dict[str, Exception]) -> None:
+        self.errors = errors
+        failed = ", ".join(f"{name!r} ({error!r})" for name, error in errors.items())
+        message = f"Failed to close resources: {failed}"
+        super().__init__(message)
@@ -1,14 +1,40 @@
 import asyncio
+import contextlib
 import inspect
 import sys
-from functools import wraps
-from inspect import Signature
-from typing import Any, Callable, Coroutine, List, TypeVar, cast
+from functools import partial, wraps
+from inspect import Parameter, Signature
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+from typing_extensions import Annotated, get_args, get_origin, get_type_hints
 
 from injection.provide import Provide
-from injection.providers import Resource
-from injection.providers.base import BaseProvider
-from injection.providers.base_factory import BaseFactoryProvider
+from injection.providers import Resource, Scoped
+from injection.providers.base import NOT_RESOLVED, BaseProvider
+from injection.scope import (
+    enter_function_scope,
+    exit_function_scope,
+    get_request_scope,
+    get_resolution_session,
+    request_scope,
+    resolution_session,
+)
 
 if sys.version_info < (3, 10):
     from typing_extensions import ParamSpec
@@ -19,42 +45,51 @@ P = ParamSpec("P")
 T = TypeVar("T")
 
 
-async def close_related_function_scope_resources_async(
-    providers: List[BaseProvider[Any]],
-) -> None:
-    async_resources = set()
-
-    while providers:
-        provider = providers.pop()
-
-        if (
-            isinstance(provider, Resource)
-            and provider.initialized
-            and provider.function_scope
-        ):
-            if provider.is_async_factory:
-                async_resources.add(provider)
-            else:
-                provider.close()
+# Function scope resources in order of closing: dependents go before their dependencies
+FunctionScopeResources = Tuple[Resource[Any], ...]
 
-        for related_provider in provider.get_dependencies():
-            providers.append(related_provider)
 
-            if not isinstance(related_provider, Resource):
-                continue
+def get_function_scope_resources(
+    providers: Iterable[BaseProvider[Any]],
+) -> FunctionScopeResources:
+    """Collects function scope resources reachable from providers"""
+    visited: Set[BaseProvider[Any]] = set()
+    ordered: List[BaseProvider[Any]] = []
 
-            match_conditions = [
-                related_provider.initialized,
-                related_provider.function_scope,
-            ]
+    def visit(provider: BaseProvider[Any]) -> None:
+        if provider in visited:
+            return
 
-            if not all(match_conditions):
-                continue
+        visited.add(provider)
 
-            if related_provider.is_async_factory:
-                async_resources.add(related_provider)
-            else:
-                related_provider.close()
+        for dependency in provider.get_dependencies():
+            visit(dependency)
+
+        ordered.append(provider)
+
+    for provider in providers:
+        visit(provider)
+
+    return tuple(
+        provider
+        for provider in reversed(ordered)
+        if isinstance(provider, Resource) and provider.function_scope
+    )
+
+
+async def close_function_scope_resources_async(
+    resources: FunctionScopeResources,
+) -> None:
+    async_resources = []
+
+    for resource in resources:
+        if not resource.initialized:
+            continue
+
+        if resource.is_async_factory:
+            async_resources.append(resource)
+        else:
+            resource.close()
 
     if len(async_resources) == 0:
         return None
@@ -64,113 +99,458 @@ async def close_related_function_scope_resources_async(
     )
 
 
+def close_function_scope_resources_sync(resources: FunctionScopeResources) -> None:
+    for resource in resources:
+        if resource.initialized and not resource.is_async_factory:
+            resource.close()
+
+
+async def close_related_function_scope_resources_async(
+    providers: List[BaseProvider[Any]],
+) -> None:
+    await close_function_scope_resources_async(
+        get_function_scope_resources(providers),
+    )
+
+
 def close_related_function_scope_resources_sync(
     providers: List[BaseProvider[Any]],
 ) -> None:
-    while providers:
-        provider = providers.pop()
+    close_function_scope_resources_sync(get_function_scope_resources(providers))
 
-        if (
-            isinstance(provider, Resource)
-            and provider.initialized
-            and provider.function_scope
-            and not provider.is_async_factory
-        ):
-            provider.close()
 
-        for related_provider in provider.get_dependencies():
-            providers.append(related_provider)
+# (position, parameter name, provider, provider should be resolved with await)
+InjectionEntry = Tuple[int, str, BaseProvider[Any], bool]
+InjectionPlan = Tuple[InjectionEntry, ...]
 
-            if not isinstance(related_provider, Resource):
-                continue
+_POSITIONAL_KINDS = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+_KEYWORD_KINDS = (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
 
-            match_conditions = [
-                related_provider.initialized,
-                related_provider.function_scope,
-                not related_provider.is_async_factory,
-            ]
 
-            if not all(match_conditions):
-                continue
+def is_async_resolvable(provider: BaseProvider[Any]) -> bool:
+    return provider.requires_async
 
-            related_provider.close()
 
+def get_injection_position(parameter: Parameter, position: int) -> int:
+    if parameter.kind not in _POSITIONAL_KINDS:
+        # Can be passed only by keyword
+        return sys.maxsize
+    return position
 
-def _get_async_injected(
-    f: Callable[P, Coroutine[Any, Any, T]],
+
+def get_injection_entry(
+    position: int,
+    parameter: Parameter,
+    provider: BaseProvider[Any],
+) -> InjectionEntry:
+    return (
+        get_injection_position(parameter, position),
+        parameter.name,
+        provider,
+        is_async_resolvable(provider),
+    )
+
+
+def _get_marker_from_annotation(annotation: Any) -> Optional[Provide]:
+    """Finds marker in metadata of Annotated, e.g. Annotated[T, Depends(Provide[...])]"""
+    if get_origin(annotation) is not Annotated:
+        return None
+
+    for metadata in get_args(annotation)[1:]:
+        marker = getattr(metadata, "dependency", metadata)
+
+        if isinstance(marker, Provide):
+            return marker
+
+    return None
+
+
+def get_parameters_type_hints(
+    f: Callable[..., Any],
     signature: Signature,
-) -> Callable[P, Coroutine[Any, Any, T]]:
-    @wraps(f)
-    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        providers = []
+) -> Dict[str, Any]:
+    """
+    Evaluates string annotations of parameters one by one,
+    annotations which cannot be resolved are skipped
+    """
+    type_hints: Dict[str, Any] = {}
+    globalns: Optional[Dict[str, Any]] = None
 
-        for i, (param_name, param) in enumerate(signature.parameters.items()):
-            if i < len(args):
-                continue
+    for parameter in signature.parameters.values():
+        if not isinstance(parameter.annotation, str):
+            continue
+
+        if globalns is None:
+            globalns = _get_globals(f)
+
+        holder = SimpleNamespace(__annotations__={parameter.name: parameter.annotation})
+
+        # Annotation may be unresolvable, e.g. name imported only for type checking
+        with contextlib.suppress(Exception):
+            type_hints.update(get_type_hints(holder, globalns, include_extras=True))
+
+    return type_hints
+
+
+def _get_globals(f: Callable[..., Any]) -> Dict[str, Any]:
+    unwrapped = inspect.unwrap(f)
+    globalns = getattr(unwrapped, "__globals__", None)
+
+    if globalns is None:
+        module = sys.modules.get(getattr(unwrapped, "__module__", ""), None)
+        globalns = vars(module) if module is not None else {}
+
+    return cast(Dict[str, Any], globalns)
+
+
+def get_injection_plan(f: Callable[..., Any], signature: Signature) -> InjectionPlan:
+    """
+    Collects parameters with Provide marker as default value (maybe wrapped)
+    or in Annotated metadata (markers are passed to keyword arguments by frameworks)
+    """
+    type_hints = get_parameters_type_hints(f, signature)
+    plan = []
+
+    for position, parameter in enumerate(signature.parameters.values()):
+        # Marker may be wrapped by dependency declaration, e.g. Depends(Provide[...])
+        marker = getattr(parameter.default, "dependency", parameter.default)
+
+        if not isinstance(marker, Provide):
+            annotation = type_hints.get(parameter.name, parameter.annotation)
+            marker = _get_marker_from_annotation(annotation)
+
+        if marker is not None:
+            plan.append(get_injection_entry(position, parameter, marker.provider))
+
+    return tuple(plan)
+
+
+def _get_unplanned_parameters(
+    signature: Signature,
+    plan: InjectionPlan,
+) -> Tuple[str, ...]:
+    """
+    Parameters which can be passed by keyword and have no marker in the signature,
+    markers are still passed to them explicitly, e.g. by frameworks
+    """
+    planned = {param_name for _, param_name, _, _ in plan}
+    return tuple(
+        parameter.name
+        for parameter in signature.parameters.values()
+        if parameter.kind in _KEYWORD_KINDS and parameter.name not in planned
+    )
+
+
+async def _resolve_passed_markers_async(
+    kwargs: Dict[str, Any],
+    unplanned: Tuple[str, ...],
+    passed_providers: Optional[List[BaseProvider[Any]]],
+) -> Optional[List[BaseProvider[Any]]]:
+    """Markers passed for parameters which have no marker in the signature"""
+    for param_name in unplanned:
+        value = kwargs.get(param_name)
 
-            provide = kwargs.get(param_name, param.default)
+        if isinstance(value, Provide):
+            provider = value.provider
+            passed_providers = passed_providers or []
+            passed_providers.append(provider)
+
+            if is_async_resolvable(provider):
+                kwargs[param_name] = await provider.async_resolve()
+            else:
+                kwargs[param_name] = provider()
+
+    return passed_providers
+
+
+def _resolve_passed_markers_sync(
+    kwargs: Dict[str, Any],
+    unplanned: Tuple[str, ...],
+    passed_providers: Optional[List[BaseProvider[Any]]],
+) -> Optional[List[BaseProvider[Any]]]:
+    """Markers passed for parameters which have no marker in the signature"""
+    for param_name in unplanned:
+        value = kwargs.get(param_name)
+
+        if isinstance(value, Provide):
+            passed_providers = passed_providers or []
+            passed_providers.append(value.provider)
+            kwargs[param_name] = value.provider()
+
+    return passed_providers
+
+
+async def _inject_kwargs_async(
+    plan: InjectionPlan,
+    unplanned: Tuple[str, ...],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    *,
+    in_session: bool,
+) -> Optional[List[BaseProvider[Any]]]:
+    """Returns providers from markers passed explicitly, they are not in precomputed set"""
+    if in_session and get_resolution_session() is None:
+        with resolution_session():
+            return await _inject_kwargs_async(
+                plan,
+                unplanned,
+                args,
+                kwargs,
+                in_session=False,
+            )
+
+    passed_providers: Optional[List[BaseProvider[Any]]] = None
+    args_count = len(args)
+
+    for position, param_name, default_provider, async_mode in plan:
+        if position < args_count:
+            continue
+
+        provider = default_provider
+        should_await = async_mode
+
+        if param_name in kwargs:
+            provide = kwargs[param_name]
 
             if not isinstance(provide, Provide):
                 continue
 
             provider = provide.provider
-            providers.append(provider)
+            should_await = is_async_resolvable(provider)
 
-            if isinstance(provider, BaseFactoryProvider):
-                if provider.should_be_async_resolved:
-                    resolved_provide = await provider.async_resolve()
-                else:
-                    resolved_provide = provider()
-            else:
-                resolved_provide = provider()
+            if provider is not default_provider:
+                passed_providers = passed_providers or []
+                passed_providers.append(provider)
 
-            kwargs[param_name] = resolved_provide
+        if should_await:
+            # Created objects are returned without coroutines
+            value = provider._peek()
 
-        try:
-            result = await f(*args, **kwargs)
-        finally:
-            await close_related_function_scope_resources_async(providers)
-        return result
+            if value is NOT_RESOLVED:
+                value = await provider.async_resolve()
 
-    return wrapper
+            kwargs[param_name] = value
+        else:
+            kwargs[param_name] = provider()
 
+    return await _resolve_passed_markers_async(kwargs, unplanned, passed_providers)
 
-def _get_sync_injected(
-    f: Callable[P, T],
-    signature: Signature,
-) -> Callable[P, T]:
-    @wraps(f)
-    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-        providers = []
 
-        for i, (param_name, param) in enumerate(signature.parameters.items()):
-            if i < len(args):
-                continue
+def _inject_kwargs_sync(
+    plan: InjectionPlan,
+    unplanned: Tuple[str, ...],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    *,
+    in_session: bool,
+) -> Optional[List[BaseProvider[Any]]]:
+    """Returns providers from markers passed explicitly, they are not in precomputed set"""
+    if in_session and get_resolution_session() is None:
+        with resolution_session():
+            return _inject_kwargs_sync(plan, unplanned, args, kwargs, in_session=False)
+
+    passed_providers: Optional[List[BaseProvider[Any]]] = None
+    args_count = len(args)
+
+    for position, param_name, default_provider, _ in plan:
+        if position < args_count:
+            continue
 
-            value_or_provide = kwargs.get(param_name, param.default)
+        provider = default_provider
+
+        if param_name in kwargs:
+            value_or_provide = kwargs[param_name]
 
             if not isinstance(value_or_provide, Provide):
                 continue
 
             provider = value_or_provide.provider
-            providers.append(provider)
-            kwargs[param_name] = provider()
+
+            if provider is not default_provider:
+                passed_providers = passed_providers or []
+                passed_providers.append(provider)
+
+        kwargs[param_name] = provider()
+
+    return _resolve_passed_markers_sync(kwargs, unplanned, passed_providers)
+
+
+# Injects objects into keyword arguments of a call, returns providers of passed markers
+InjectKwargsSync = Callable[
+    [Tuple[Any, ...], Dict[str, Any]],
+    Optional[List[BaseProvider[Any]]],
+]
+InjectKwargsAsync = Callable[
+    [Tuple[Any, ...], Dict[str, Any]],
+    Awaitable[Optional[List[BaseProvider[Any]]]],
+]
+
+
+def run_injected_sync(
+    f: Callable[..., T],
+    inject_kwargs: InjectKwargsSync,
+    resources: FunctionScopeResources,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> T:
+    """Calls function with injected arguments and closes its function scope resources"""
+    if Scoped.is_used and get_request_scope() is None:
+        # The outermost injected call starts request scope
+        with request_scope():
+            return run_injected_sync(f, inject_kwargs, resources, args, kwargs)
+
+    if not resources:
+        passed_providers = inject_kwargs(args, kwargs)
+
+        if passed_providers is None:
+            return f(*args, **kwargs)
 
         try:
-            result = f(*args, **kwargs)
+            return f(*args, **kwargs)
         finally:
-            close_related_function_scope_resources_sync(providers)
-        return result
+            close_related_function_scope_resources_sync(passed_providers)
+
+    # Function scope resources of concurrent calls are isolated from each other
+    token = enter_function_scope()
+    passed_providers = None
+
+    try:
+        passed_providers = inject_kwargs(args, kwargs)
+        return f(*args, **kwargs)
+    finally:
+        try:
+            close_function_scope_resources_sync(resources)
+
+            if passed_providers is not None:
+                close_related_function_scope_resources_sync(passed_providers)
+        finally:
+            exit_function_scope(token)
+
+
+async def run_injected_async(
+    f: Callable[..., Coroutine[Any, Any, T]],
+    inject_kwargs: InjectKwargsAsync,
+    resources: FunctionScopeResources,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> T:
+    """Awaits function with injected arguments and closes its function scope resources"""
+    if Scoped.is_used and get_request_scope() is None:
+        with request_scope():
+            return await run_injected_async(f, inject_kwargs, resources, args, kwargs)
+
+    if not resources:
+        passed_providers = await inject_kwargs(args, kwargs)
+
+        if passed_providers is None:
+            return await f(*args, **kwargs)
+
+        try:
+            return await f(*args, **kwargs)
+        finally:
+            await close_related_function_scope_resources_async(passed_providers)
+
+    token = enter_function_scope()
+    passed_providers = None
+
+    try:
+        passed_providers = await inject_kwargs(args, kwargs)
+        return await f(*args, **kwargs)
+    finally:
+        try:
+            await close_function_scope_resources_async(resources)
+
+            if passed_providers is not None:
+                await close_related_function_scope_resources_async(passed_providers)
+        finally:
+            exit_function_scope(token)
+
+
+def _get_async_injected(
+    f: Callable[P, Coroutine[Any, Any, T]],
+    plan: InjectionPlan,
+    unplanned: Tuple[str, ...],
+    resources: FunctionScopeResources,
+    *,
+    in_session: bool,
+) -> Callable[P, Coroutine[Any, Any, T]]:
+    inject_kwargs = partial(
+        _inject_kwargs_async,
+        plan,
+        unplanned,
+        in_session=in_session,
+    )
+
+    @wraps(f)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return await run_injected_async(f, inject_kwargs, resources, args, kwargs)
 
     return wrapper
 
 
-def inject(f: Callable[P, T]) -> Callable[P, T]:
-    """Decorate callable with injecting decorator"""
-    signature = inspect.signature(f)
+def _get_sync_injected(
+    f: Callable[P, T],
+    plan: InjectionPlan,
+    unplanned: Tuple[str, ...],
+    resources: FunctionScopeResources,
+    *,
+    in_session: bool,
+) -> Callable[P, T]:
+    inject_kwargs = partial(_inject_kwargs_sync, plan, unplanned, in_session=in_session)
+
+    @wraps(f)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return run_injected_sync(f, inject_kwargs, resources, args, kwargs)
+
+    return wrapper
 
-    if inspect.iscoroutinefunction(f):
-        func_with_injected_params = _get_async_injected(f, signature)
-        return cast(Callable[P, T], func_with_injected_params)
 
-    return _get_sync_injected(f, signature)
+@overload
+def inject(f: Callable[P, T]) -> Callable[P, T]: ...
+
+
+@overload
+def inject(
+    *,
+    resolution_session: bool = False,
+) -> Callable[[Callable[P, T]], Callable[P, T]]: ...
+
+
+def inject(
+    f: Optional[Callable[P, T]] = None,
+    *,
+    resolution_session: bool = False,
+) -> Union[Callable[P, T], Callable[[Callable[P, T]], Callable[P, T]]]:
+    """
+    Decorate callable with injecting decorator.
+    With resolution session providers shared by injected objects are resolved once per call.
+    """
+
+    def decorator(f: Callable[P, T]) -> Callable[P, T]:
+        signature = inspect.signature(f)
+        plan = get_injection_plan(f, signature)
+        unplanned = _get_unplanned_parameters(signature, plan)
+        resources = get_function_scope_resources(provider for _, _, provider, _ in plan)
+
+        if inspect.iscoroutinefunction(f):
+            func_with_injected_params = _get_async_injected(
+                f,
+                plan,
+                unplanned,
+                resources,
+                in_session=resolution_session,
+            )
+            return cast(Callable[P, T], func_with_injected_params)
+
+        return _get_sync_injected(
+            f,
+            plan,
+            unplanned,
+            resources,
+            in_session=resolution_session,
+        )
+
+    if f is None:
+        return decorator
+
+    return decorator(f)
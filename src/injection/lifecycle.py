@@ -0,0 +1,400 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from injection.exceptions import ResourcesShutdownError
+from injection.providers import Resource
+from injection.providers.base import BaseProvider
+
+T = TypeVar("T")
+
+# Provider names with their providers, names are used in reports
+NamedProviders = Mapping[str, BaseProvider[Any]]
+
+
+def get_dependency_layers(
+    providers: Sequence[BaseProvider[Any]],
+) -> List[List[BaseProvider[Any]]]:
+    """
+    Groups providers in layers: providers of a layer depend only on providers
+    of previous layers. Dependencies which are not in the given providers
+    are passed through, so their dependencies are taken into account.
+    """
+    targets = set(providers)
+    target_dependencies = {
+        provider: _get_target_dependencies(provider, targets) for provider in providers
+    }
+    layers: List[List[BaseProvider[Any]]] = []
+    placed: Set[BaseProvider[Any]] = set()
+    remaining = list(providers)
+
+    while remaining:
+        layer = [
+            provider
+            for provider in remaining
+            if target_dependencies[provider] <= placed
+        ]
+
+        if not layer:
+            msg = "Providers have circular dependencies"
+            raise RuntimeError(msg)
+
+        layers.append(layer)
+        placed.update(layer)
+        remaining = [provider for provider in remaining if provider not in placed]
+
+    return layers
+
+
+def _get_target_dependencies(
+    provider: BaseProvider[Any],
+    targets: Set[BaseProvider[Any]],
+) -> Set[BaseProvider[Any]]:
+    """Nearest transitive dependencies of provider which are in targets"""
+    found: Set[BaseProvider[Any]] = set()
+    visited: Set[BaseProvider[Any]] = set()
+    dependencies = list(provider.get_dependencies())
+
+    while dependencies:
+        dependency = dependencies.pop()
+
+        if dependency in visited:
+            continue
+
+        visited.add(dependency)
+
+        if dependency in targets:
+            found.add(dependency)
+        else:
+            dependencies.extend(dependency.get_dependencies())
+
+    return found
+
+
+class WarmupReport:
+    """Durations of initialization of providers in seconds"""
+
+    __slots__ = ("durations", "layers", "total")
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+        self.layers: List[List[str]] = []
+        self.total = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(total={self.total:.6f}, "
+            f"layers={self.layers!r}, durations={self.durations!r})"
+        )
+
+
+def _timed_resolve(provider: BaseProvider[Any]) -> float:
+    started = time.perf_counter()
+    provider()
+    return time.perf_counter() - started
+
+
+async def _timed_async_resolve(provider: BaseProvider[Any]) -> float:
+    started = time.perf_counter()
+    await provider.async_resolve()
+    return time.perf_counter() - started
+
+
+def _get_layers_with_names(
+    providers: NamedProviders,
+) -> List[List[Tuple[str, BaseProvider[Any]]]]:
+    names = {provider: name for name, provider in providers.items()}
+    return [
+        [(names[provider], provider) for provider in layer]
+        for layer in get_dependency_layers(list(providers.values()))
+    ]
+
+
+def warmup(
+    providers: NamedProviders,
+    *,
+    max_workers: Optional[int] = None,
+) -> WarmupReport:
+    """
+    Initializes providers layer by layer, providers of the same layer
+    are initialized concurrently in threads.
+    Providers which require await are skipped, use warmup_async for them.
+    """
+    report = WarmupReport()
+    started = time.perf_counter()
+    sync_providers = {
+        name: provider
+        for name, provider in providers.items()
+        if not provider.requires_async
+    }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for layer in _get_layers_with_names(sync_providers):
+            # Each thread runs in a copy of the current context, e.g. with local overrides
+            futures = [
+                executor.submit(copy_context().run, _timed_resolve, provider)
+                for _, provider in layer
+            ]
+
+            for (name, _), future in zip(layer, futures):
+                report.durations[name] = future.result()
+
+            report.layers.append([name for name, _ in layer])
+
+    report.total = time.perf_counter() - started
+    return report
+
+
+async def warmup_async(
+    providers: NamedProviders,
+    *,
+    max_workers: Optional[int] = None,
+) -> WarmupReport:
+    """
+    Initializes providers layer by layer. Providers of the same layer are
+    initialized concurrently: sync ones in threads, async ones in the event loop.
+    """
+    report = WarmupReport()
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for layer in _get_layers_with_names(providers):
+            durations = await asyncio.gather(
+                *[
+                    _timed_async_resolve(provider)
+                    if provider.requires_async
+                    else loop.run_in_executor(
+                        executor,
+                        copy_context().run,
+                        _timed_resolve,
+                        provider,
+                    )
+                    for _, provider in layer
+                ],
+            )
+
+            for (name, _), duration in zip(layer, durations):
+                report.durations[name] = duration
+
+            report.layers.append([name for name, _ in layer])
+
+    report.total = time.perf_counter() - started
+    return report
+
+
+class ScheduleReport:
+    """
+    Durations of initialization of providers in seconds and the critical path:
+    the chain of dependent providers which determines the total duration.
+    """
+
+    __slots__ = ("critical_path", "critical_path_duration", "durations", "total")
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+        self.critical_path: List[str] = []
+        self.critical_path_duration = 0.0
+        self.total = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(total={self.total:.6f}, "
+            f"critical_path={self.critical_path!r}, "
+            f"critical_path_duration={self.critical_path_duration:.6f})"
+        )
+
+
+def _fill_critical_path(
+    report: ScheduleReport,
+    names: Mapping[BaseProvider[Any], str],
+    dependencies: Mapping[BaseProvider[Any], Set[BaseProvider[Any]]],
+    finished: Mapping[BaseProvider[Any], float],
+) -> None:
+    if not finished:
+        return
+
+    # Provider starts when its last dependency is finished, so path goes through it
+    provider: Optional[BaseProvider[Any]] = max(finished, key=finished.__getitem__)
+    path: List[str] = []
+
+    while provider is not None:
+        path.append(names[provider])
+        provider = max(
+            dependencies[provider],
+            key=finished.__getitem__,
+            default=None,
+        )
+
+    report.critical_path = path[::-1]
+    report.critical_path_duration = sum(report.durations[name] for name in path)
+
+
+async def schedule_async(
+    providers: NamedProviders,
+    *,
+    max_workers: Optional[int] = 0,
+) -> ScheduleReport:
+    """
+    Initializes each provider as soon as its dependencies are initialized:
+    async providers in the event loop, sync ones inline in the loop thread by default,
+    with max_workers other than zero they are initialized in threads of a pool.
+    On error not started providers are cancelled and the error is raised.
+    """
+    report = ScheduleReport()
+    names = {provider: name for name, provider in providers.items()}
+    targets = set(names)
+    dependencies = {
+        provider: _get_target_dependencies(provider, targets) for provider in names
+    }
+    finished: Dict[BaseProvider[Any], float] = {}
+    tasks: Dict[BaseProvider[Any], asyncio.Task[None]] = {}
+    started = time.perf_counter()
+
+    async def initialize(provider: BaseProvider[Any]) -> None:
+        await asyncio.gather(
+            *[tasks[dependency] for dependency in dependencies[provider]],
+        )
+
+        if provider.requires_async:
+            duration = await _timed_async_resolve(provider)
+        else:
+            duration = await _run_sync(executor, _timed_resolve, provider)
+
+        report.durations[names[provider]] = duration
+        finished[provider] = time.perf_counter()
+
+    executor = _create_executor(max_workers)
+
+    try:
+        # Tasks of dependencies are created before tasks of their dependents
+        for layer in get_dependency_layers(list(names)):
+            for provider in layer:
+                tasks[provider] = asyncio.ensure_future(initialize(provider))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    report.total = time.perf_counter() - started
+    _fill_critical_path(report, names, dependencies, finished)
+    return report
+
+
+def _create_executor(max_workers: Optional[int]) -> Optional[ThreadPoolExecutor]:
+    """Zero workers means that sync providers are run inline in the loop thread"""
+    return None if max_workers == 0 else ThreadPoolExecutor(max_workers=max_workers)
+
+
+async def _run_sync(
+    executor: Optional[ThreadPoolExecutor],
+    function: Callable[..., T],
+    *args: Any,
+) -> T:
+    if executor is None:
+        return function(*args)
+
+    # Each thread runs in a copy of the current context, e.g. with local overrides
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        partial(copy_context().run, function, *args),
+    )
+
+
+async def _close(
+    resource: Resource[Any],
+    executor: Optional[ThreadPoolExecutor],
+    timeout: Optional[float],
+) -> None:
+    if resource.is_async_factory:
+        await asyncio.wait_for(resource.async_close(), timeout)
+    elif executor is None:
+        # Thread-affine resources, e.g. sqlite connections, are closed where created
+        resource.close()
+    else:
+        await asyncio.wait_for(_run_sync(executor, resource.close), timeout)
+
+
+async def shutdown_async(
+    resources: Mapping[str, Resource[Any]],
+    *,
+    timeout: Optional[float] = None,
+    resource_timeout: Optional[float] = None,
+    max_workers: Optional[int] = 0,
+) -> None:
+    """
+    Closes initialized resources in reverse order of dependencies:
+    dependents are closed before resources they depend on.
+    Resources of the same layer are closed concurrently.
+    Sync resources are closed inline in the loop thread by default,
+    with max_workers other than zero they are closed in threads of a pool.
+    Closing of each resource is limited by resource_timeout,
+    closing of all resources is limited by timeout,
+    sync resources closed inline are not limited by timeouts.
+    All errors, including timeouts, are raised together after closing of all layers.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    names = {resource: name for name, resource in resources.items()}
+    errors: Dict[str, Exception] = {}
+    executor = _create_executor(max_workers)
+
+    try:
+        for layer in reversed(get_dependency_layers(list(names))):
+            initialized = [
+                resource
+                for resource in layer
+                if isinstance(resource, Resource) and resource.initialized
+            ]
+            layer_timeout = resource_timeout
+
+            if deadline is not None:
+                remaining = max(deadline - loop.time(), 0.0)
+                layer_timeout = (
+                    remaining
+                    if layer_timeout is None
+                    else min(remaining, layer_timeout)
+                )
+
+            results = await asyncio.gather(
+                *[
+                    _close(resource, executor, layer_timeout)
+                    for resource in initialized
+                ],
+                return_exceptions=True,
+            )
+
+            for resource, result in zip(initialized, results):
+                if isinstance(result, Exception):
+                    errors[names[resource]] = result
+                elif isinstance(result, BaseException):
+                    raise result
+    finally:
+        if executor is not None:
+            # Hung sync resources must not block shutdown, so threads are not joined
+            executor.shutdown(wait=False)
+
+    if errors:
+        raise ResourcesShutdownError(errors)
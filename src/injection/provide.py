@@ -11,6 +11,8 @@ class ClassGetItemMeta(type):
 
 
 class Provide(metaclass=ClassGetItemMeta):
+    __slots__ = ("provider",)
+
     def __init__(self, provider: BaseProvider[T]) -> None:
         self.provider = provider
 
@@ -1,9 +1,17 @@
-from operator import attrgetter
-from typing import TYPE_CHECKING, Any, List
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
 if TYPE_CHECKING:
     from injection.providers.base import BaseProvider
 
+# (kind, value): attribute name, item key or arguments of call
+Step = Tuple[str, Any]
+Getter = Callable[[Any], Any]
+
+_ATTRIBUTE = "attribute"
+_ITEM = "item"
+_CALL = "call"
+
 
 def _get_value_from_object_by_dotted_path(obj: Any, path: str) -> Any:
     # https://stackoverflow.com/questions/31174295/getattr-and-setattr-on-nested-subobjects-chained-properties
@@ -12,31 +20,124 @@ def _get_value_from_object_by_dotted_path(obj: Any, path: str) -> Any:
     return attr_value
 
 
+def _chain(getter: Optional[Getter], step_getter: Getter) -> Getter:
+    if getter is None:
+        return step_getter
+
+    def _get(obj: Any) -> Any:
+        return step_getter(getter(obj))
+
+    return _get
+
+
+def _caller(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Getter:
+    def _call(function: Any) -> Any:
+        return function(*args, **kwargs)
+
+    return _call
+
+
 class ProvidedInstance:
+    """
+    Path to the value inside of the object of provider.
+    Paths are immutable, the same attribute and string key steps from the same path
+    return the same path object.
+    Getter of the value is built once, when the path is created.
+    """
+
+    __slots__ = ("_children", "_getter", "_path", "_provided", "_steps")
+
     def __init__(self, provided: "BaseProvider[Any]") -> None:
         self._provided = provided
-        self._attrs: List[str] = []
+        self._steps: Tuple[Step, ...] = ()
+        # Dotted path while all steps are attributes, then one attrgetter is used
+        self._path: Optional[str] = ""
+        self._getter: Optional[Getter] = None
+        self._children: Optional[Dict[Step, ProvidedInstance]] = None
+
+    def _create_child(
+        self,
+        step: Step,
+        step_getter: Getter,
+        path: Optional[str],
+    ) -> "ProvidedInstance":
+        child = ProvidedInstance(self._provided)
+        child._steps = (*self._steps, step)
+        child._path = path
+        child._getter = attrgetter(path) if path else _chain(self._getter, step_getter)
+        return child
+
+    def _get_child(
+        self,
+        step: Step,
+        step_getter: Getter,
+        path: Optional[str] = None,
+    ) -> "ProvidedInstance":
+        children = self._children
+
+        if children is None:
+            children = self._children = {}
+
+        child = children.get(step)
+
+        if child is None:
+            child = children[step] = self._create_child(step, step_getter, path)
+
+        return child
 
     def __getattr__(self, attr: str) -> "ProvidedInstance":
-        self._attrs.append(attr)
-        return self
+        if attr.startswith("__"):
+            # Protocols of copy, pickle, mocks and etc. should not become steps
+            raise AttributeError(attr)
+
+        path = None
+
+        if self._path is not None:
+            path = f"{self._path}.{attr}" if self._path else attr
+
+        return self._get_child((_ATTRIBUTE, attr), attrgetter(attr), path)
+
+    def __getitem__(self, key: Any) -> "ProvidedInstance":
+        step = (_ITEM, key)
+
+        # Equal keys of other types, e.g. 1 and True, must not share a path
+        if type(key) is str:
+            return self._get_child(step, itemgetter(key))
+
+        return self._create_child(step, itemgetter(key), None)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "ProvidedInstance":
+        """
+        Adds call of the value as a step of the path.
+        Paths with calls are not interned, so arguments are not kept alive by parent.
+        """
+        step = (_CALL, (args, tuple(kwargs.items())))
+        return self._create_child(step, _caller(args, kwargs), None)
 
     def call(self, *args: Any, **kwargs: Any) -> Any:
         function = self.get_value()
         return function(*args, **kwargs)
 
-    def get_value(self) -> Any:
-        resolved_provider_object = self._provided()
+    def _get_getter(self) -> Getter:
+        getter = self._getter
 
-        if not self._attrs:
+        if getter is None:
             msg = (
                 "Please provide at least one attribute. For example: provide.some_attr"
             )
             raise Exception(msg)
 
-        attribute_path = ".".join(self._attrs)
-        attr_value = _get_value_from_object_by_dotted_path(
-            resolved_provider_object,
-            attribute_path,
-        )
-        return attr_value
+        return getter
+
+    def get_value(self) -> Any:
+        getter = self._get_getter()
+        return getter(self._provided())
+
+    async def async_get_value(self) -> Any:
+        getter = self._get_getter()
+        provided = self._provided
+
+        if provided.requires_async:
+            return getter(await provided.async_resolve())
+
+        return getter(provided())
@@ -2,6 +2,7 @@ from injection.providers.coroutine import Coroutine
 from injection.providers.factory import Factory
 from injection.providers.object import Object
 from injection.providers.resource import Resource
+from injection.providers.scoped import Scoped
 from injection.providers.singleton import Singleton
 from injection.providers.transient import Transient
 
@@ -10,6 +11,7 @@ __all__ = [
     "Factory",
     "Object",
     "Resource",
+    "Scoped",
     "Singleton",
     "Transient",
 ]
@@ -1,7 +1,26 @@
 import sys
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from typing import Any, Generic, Iterator, List, TypeVar, cast
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Final,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 if sys.version_info < (3, 10):
     from typing_extensions import ParamSpec
@@ -14,11 +33,98 @@ P = ParamSpec("P")
 T = TypeVar("T")
 
 
+def _resolve_mock(provider: "BaseProvider[T]", *_: Any, **__: Any) -> T:
+    return cast(T, provider._mocks[-1])
+
+
+async def _async_resolve_mock(provider: "BaseProvider[T]", *_: Any, **__: Any) -> T:
+    return cast(T, provider._mocks[-1])
+
+
+# Returned by peek of provider which cannot return its value without await
+NOT_RESOLVED: Final = object()
+
+# Single weak reference to dependent or list of them
+Dependents = Union[
+    "weakref.ref[BaseProvider[Any]]",
+    List["weakref.ref[BaseProvider[Any]]"],
+]
+
+# Mocks of local overrides, visible only in the current context
+LocalMocks = Mapping["BaseProvider[Any]", Tuple[Any, ...]]
+
+_local_mocks: "ContextVar[LocalMocks]" = ContextVar(
+    "injection_local_mocks",
+    default=MappingProxyType({}),
+)
+# Numbers of active local overrides in all contexts, kept outside of providers,
+# because local overrides are rare and most providers never have them
+_local_overrides_counts: Dict["BaseProvider[Any]", int] = {}
+# Local overrides are changed from different threads
+_overrides_lock = threading.Lock()
+
+
+def _resolve_local_mock(provider: "BaseProvider[T]", *args: Any, **kwargs: Any) -> T:
+    mocks = _local_mocks.get().get(provider)
+
+    if mocks:
+        return cast(T, mocks[-1])
+
+    if provider._mocks:
+        return cast(T, provider._mocks[-1])
+
+    return type(provider)._resolve(provider, *args, **kwargs)
+
+
+async def _async_resolve_local_mock(
+    provider: "BaseProvider[T]",
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    mocks = _local_mocks.get().get(provider)
+
+    if mocks:
+        return cast(T, mocks[-1])
+
+    if provider._mocks:
+        return cast(T, provider._mocks[-1])
+
+    return await type(provider)._async_resolve(provider, *args, **kwargs)
+
+
 class BaseProvider(Generic[T], ABC):
+    __slots__ = (
+        "__weakref__",
+        "_args",
+        "_async_resolver",
+        "_dependents",
+        "_kwargs",
+        "_mocks",
+        "_provided_instance",
+        "_requires_async",
+        "_resolver",
+    )
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self._args = args
         self._kwargs = kwargs
-        self._mocks: List[Any] = []
+        # Replaced on each override, so providers without overrides share empty tuple
+        self._mocks: Tuple[Any, ...] = ()
+        # Weak references to dependents, WeakSet is too heavy for large containers
+        self._dependents: Optional[Dependents] = None
+        self._requires_async: Optional[bool] = None
+        self._provided_instance: Optional[ProvidedInstance] = None
+        # Active resolvers are swapped on override, so resolving does not check mocks
+        self._resolver: Callable[..., T]
+        self._async_resolver: Callable[..., Coroutine[Any, Any, T]]
+        self._set_resolvers()
+
+        unique_dependencies = {
+            id(dependency): dependency for dependency in self.get_dependencies()
+        }
+
+        for dependency in unique_dependencies.values():
+            dependency._add_dependent(self)
 
     @abstractmethod
     def _resolve(self, *args: Any, **kwargs: Any) -> T:
@@ -28,35 +134,128 @@ class BaseProvider(Generic[T], ABC):
     async def _async_resolve(self, *args: Any, **kwargs: Any) -> T:
         raise NotImplementedError
 
-    async def async_resolve(self, *args: Any, **kwargs: Any) -> T:
-        if self._mocks:
-            return cast(T, self._mocks[-1])
-        return await self._async_resolve(*args, **kwargs)
+    def async_resolve(self, *args: Any, **kwargs: Any) -> Coroutine[Any, Any, T]:
+        return self._async_resolver(self, *args, **kwargs)
 
     def __call__(self, *args: Any, **kwargs: Any) -> T:
-        if self._mocks:
-            return cast(T, self._mocks[-1])
-        return self._resolve(*args, **kwargs)
+        return self._resolver(self, *args, **kwargs)
+
+    def _set_resolvers(self) -> None:
+        with _overrides_lock:
+            if self in _local_overrides_counts:
+                self._resolver = _resolve_local_mock
+                self._async_resolver = _async_resolve_local_mock
+            elif self._mocks:
+                self._resolver = _resolve_mock
+                self._async_resolver = _async_resolve_mock
+            else:
+                # Plain functions, bound methods in slots would make reference cycles
+                provider_type = type(self)
+                self._resolver = provider_type._resolve
+                self._async_resolver = provider_type._async_resolve
 
     @property
     def provided(self) -> ProvidedInstance:
-        return ProvidedInstance(provided=self)
+        provided = self._provided_instance
+
+        if provided is None:
+            provided = self._provided_instance = ProvidedInstance(provided=self)
+
+        return provided
 
     def override(self, mock: Any) -> None:
-        self._mocks.append(mock)
+        self._mocks = (*self._mocks, mock)
+        self._set_resolvers()
+        self._invalidate()
 
     @contextmanager
-    def override_context(self, mock: Any) -> Iterator[None]:
+    def override_context(self, mock: Any, *, local: bool = False) -> Iterator[None]:
+        """
+        Local override is visible only in the current context (task or thread)
+        and its copies, global override is visible everywhere.
+        """
+        if local:
+            with self._local_override_context(mock):
+                yield
+            return
+
         self.override(mock)
         try:
             yield
         finally:
             self.reset_override()
 
+    @contextmanager
+    def _local_override_context(self, mock: Any) -> Iterator[None]:
+        local_mocks = _local_mocks.get()
+        token = _local_mocks.set(
+            {**local_mocks, self: (*local_mocks.get(self, ()), mock)},
+        )
+        self._change_local_overrides_count(1)
+
+        try:
+            yield
+        finally:
+            self._change_local_overrides_count(-1)
+            _local_mocks.reset(token)
+
+    def _change_local_overrides_count(self, delta: int) -> None:
+        with _overrides_lock:
+            count = _local_overrides_counts.get(self, 0) + delta
+
+            if count:
+                _local_overrides_counts[self] = count
+            else:
+                del _local_overrides_counts[self]
+
+        self._set_resolvers()
+        self._invalidate()
+
     def reset_override(self) -> None:
         if not self._mocks:
             return
-        self._mocks.pop(-1)
+        self._mocks = self._mocks[:-1]
+        self._set_resolvers()
+        self._invalidate()
+
+    @property
+    def requires_async(self) -> bool:
+        """Provider or some of its transitive dependencies is resolved with await"""
+        requires_async = self._requires_async
+
+        if requires_async is None:
+            requires_async = self._is_async() or any(
+                dependency.requires_async for dependency in self.get_dependencies()
+            )
+            self._requires_async = requires_async
+
+        return requires_async
+
+    def _is_async(self) -> bool:
+        return False
+
+    def _is_resolved(self) -> bool:
+        """Value is returned without creating it"""
+        return bool(self._mocks) or (
+            self in _local_overrides_counts and self in _local_mocks.get()
+        )
+
+    def _peek(self) -> Any:
+        """
+        Returns value without await when it is already created or overridden,
+        otherwise NOT_RESOLVED. Async injection skips coroutines for such values.
+        """
+        if self._is_resolved():
+            return self()
+        return NOT_RESOLVED
+
+    def _has_overrides(self) -> bool:
+        """Provider is overridden globally or locally in some context"""
+        return bool(self._mocks) or self in _local_overrides_counts
+
+    def _get_constant(self) -> Any:
+        """Value which dependents may embed instead of resolving, None if it may change"""
+        return None
 
     @property
     def cast(self) -> T:
@@ -64,10 +263,64 @@ class BaseProvider(Generic[T], ABC):
         return cast(T, self)
 
     def get_dependencies(self) -> Iterator["BaseProvider[Any]"]:
-        for arg in self._args:
-            if isinstance(arg, BaseProvider):
-                yield arg
+        for arg in (*self._args, *self._kwargs.values()):
+            dependency = arg._provided if isinstance(arg, ProvidedInstance) else arg
+
+            if isinstance(dependency, BaseProvider):
+                yield dependency
+
+    def get_dependents(self) -> List["BaseProvider[Any]"]:
+        """Providers which use this provider as a direct dependency"""
+        references = self._dependents
+
+        if references is None:
+            return []
+
+        if not isinstance(references, list):
+            references = [references]
+
+        dependents = [reference() for reference in references]
+        return [dependent for dependent in dependents if dependent is not None]
+
+    def _add_dependent(self, provider: "BaseProvider[Any]") -> None:
+        dependents = self._dependents
+        reference = weakref.ref(provider)
+
+        if dependents is None:
+            # Most providers have a single dependent, so list is created for the second
+            self._dependents = reference
+        elif not isinstance(dependents, list):
+            alive = dependents() is not None
+            self._dependents = [dependents, reference] if alive else reference
+        else:
+            if len(dependents) & (len(dependents) - 1) == 0:
+                # Drops references to collected providers when size reaches power of two
+                dependents[:] = [ref for ref in dependents if ref() is not None]
+
+            dependents.append(reference)
+
+    def _reset_cache(self) -> None:
+        """Drops everything that provider precomputed for resolving"""
+        self._requires_async = None
+
+    def _reset_plan(self) -> None:
+        """Drops arguments of provider classified for resolving"""
+
+    def _reset_dependent_plans(self) -> None:
+        """Dependents embed constant of provider, so they classify arguments again"""
+        for dependent in self.get_dependents():
+            dependent._reset_plan()
+
+    def _invalidate(self) -> None:
+        """Drops precomputed data of provider and all providers which depend on it"""
+        visited = {self}
+        providers: List[BaseProvider[Any]] = [self]
+
+        while providers:
+            provider = providers.pop()
+            provider._reset_cache()
 
-        for arg in self._kwargs.values():
-            if isinstance(arg, BaseProvider):
-                yield arg
+            for dependent in provider.get_dependents():
+                if dependent not in visited:
+                    visited.add(dependent)
+                    providers.append(dependent)
@@ -1,9 +1,15 @@
+import asyncio
 import inspect
 import sys
+import threading
 from typing import (
     Any,
     Awaitable,
     Callable,
+    ClassVar,
+    Dict,
+    Optional,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -15,10 +21,20 @@ else:
     from typing import ParamSpec
 
 from injection.providers.base import BaseProvider
-from injection.resolving import resolve_provider_args, resolve_provider_args_async
+from injection.resolving import ResolutionPlan
+from injection.scope import ResolutionSession, get_resolution_session
 
 P = ParamSpec("P")
 T = TypeVar("T")
+FactoryProviderType = TypeVar("FactoryProviderType", bound="BaseFactoryProvider[Any]")
+
+# Resolving in progress in each event loop, futures can't be awaited in other loops
+PendingByLoop = Dict[asyncio.AbstractEventLoop, "asyncio.Future[Any]"]
+
+# Guards storing of plans against concurrent invalidation
+_plans_lock = threading.Lock()
+# Guards creation of pending resolving mappings in concurrent threads
+_pending_lock = threading.Lock()
 
 
 def _is_async_factory(factory: Callable[P, T]) -> bool:
@@ -31,6 +47,20 @@ def _is_async_factory(factory: Callable[P, T]) -> bool:
 
 
 class BaseFactoryProvider(BaseProvider[T]):
+    __slots__ = (
+        "_compiled",
+        "_concurrent",
+        "_factory",
+        "_interfaces",
+        "_is_async_factory",
+        "_pending",
+        "_plan",
+        "_plan_generation",
+    )
+
+    # Objects are created once in resolution session
+    _memoized_in_session: ClassVar[bool] = False
+
     def __init__(
         self,
         factory: Union[Callable[P, T], Callable[P, Awaitable[T]]],
@@ -40,6 +70,14 @@ class BaseFactoryProvider(BaseProvider[T]):
         super().__init__(*args, **kwargs)
         self._factory = factory
         self._is_async_factory = _is_async_factory(factory)
+        self._plan: Optional[ResolutionPlan] = None
+        # Changed on each invalidation of the plan
+        self._plan_generation = 0
+        self._compiled: Optional[Callable[[], Any]] = None
+        self._interfaces: Tuple[Any, ...] = ()
+        self._concurrent = False
+        # Resolving in progress which is awaited by concurrent callers of the same loop
+        self._pending: Optional[PendingByLoop] = None
 
     @property
     def is_async_factory(self) -> bool:
@@ -49,21 +87,134 @@ class BaseFactoryProvider(BaseProvider[T]):
     def factory(self) -> Union[Callable[P, T], Callable[P, Awaitable[T]]]:
         return self._factory  # type: ignore[return-value]
 
+    @property
+    def interfaces(self) -> Tuple[Any, ...]:
+        return self._interfaces
+
+    def implements(
+        self: FactoryProviderType,
+        *interfaces: Any,
+    ) -> FactoryProviderType:
+        """Declares additional types by which provider is found with auto injection"""
+        self._interfaces = (*self._interfaces, *interfaces)
+        return self
+
+    def resolve_concurrently(self: FactoryProviderType) -> FactoryProviderType:
+        """
+        Async dependencies which don't share async dependencies are resolved
+        concurrently on await, by default they are resolved one by one
+        """
+        self._concurrent = True
+        self._reset_plan()
+        return self
+
+    def _create_plan(self) -> ResolutionPlan:
+        return ResolutionPlan(
+            self._factory,
+            self._args,
+            self._kwargs,
+            concurrent=self._concurrent,
+        )
+
+    def _get_plan(self) -> ResolutionPlan:
+        plan = self._plan
+
+        if plan is None:
+            generation = self._plan_generation
+            plan = self._create_plan()
+
+            with _plans_lock:
+                # Plan invalidated while it was built may be stale, so it is not stored
+                if self._plan_generation == generation:
+                    self._plan = plan
+
+        return plan
+
+    def _is_async(self) -> bool:
+        return self._is_async_factory
+
+    def _reset_cache(self) -> None:
+        super()._reset_cache()
+        self._reset_plan()
+        self._compiled = None
+
+    def _reset_plan(self) -> None:
+        with _plans_lock:
+            self._plan_generation += 1
+            self._plan = None
+
+    async def _async_resolve_once(self, resolve: Callable[[], Awaitable[T]]) -> T:
+        """
+        Concurrent callers share one resolving and get its result or its error.
+        Failed resolving is not cached, so next call resolves object again.
+        Callers in other event loops, e.g. in other threads, don't share resolving.
+        """
+        loop = asyncio.get_running_loop()
+        pending_by_loop = self._get_pending_by_loop()
+        pending = pending_by_loop.get(loop)
+
+        if pending is not None:
+            try:
+                return cast(T, await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Resolving was cancelled in another task, so try again
+                return await self._async_resolve_once(resolve)
+
+        pending = pending_by_loop[loop] = loop.create_future()
+
+        try:
+            value = await resolve()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except BaseException as exc:
+            pending.set_exception(exc)
+            # Mark error as retrieved, because there may be no other callers
+            pending.exception()
+            raise
+        else:
+            pending.set_result(value)
+            return value
+        finally:
+            del pending_by_loop[loop]
+
+    def _get_pending_by_loop(self) -> PendingByLoop:
+        pending_by_loop = self._pending
+
+        if pending_by_loop is None:
+            with _pending_lock:
+                pending_by_loop = self._pending
+
+                if pending_by_loop is None:
+                    pending_by_loop = self._pending = {}
+
+        return pending_by_loop
+
     async def _async_resolve(self, *args: Any, **kwargs: Any) -> T:
         """
         Positional arguments are appended after Factory positional dependencies.
         Keyword arguments have the priority over the Factory keyword dependencies with the same name.
         """
-        resolved_args, resolved_kwargs = await resolve_provider_args_async(
-            *self._args,
-            **self._kwargs,
-        )
-        resolved_kwargs.update(kwargs)
+        if self._memoized_in_session and not args and not kwargs:
+            session = get_resolution_session()
+
+            if session is not None:
+                try:
+                    return cast(T, session[self])
+                except KeyError:
+                    instance = await self._async_build((), {})
+                    session[self] = instance
+                    return instance
+
+        return await self._async_build(args, kwargs)
+
+    async def _async_build(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> T:
+        instance = await self._get_plan().async_resolve(args, kwargs)
 
         if self._is_async_factory:
-            instance = await self._factory(*resolved_args, *args, **resolved_kwargs)  # type: ignore[misc]
-        else:
-            instance = self._factory(*resolved_args, *args, **resolved_kwargs)
+            instance = await instance
 
         return cast(T, instance)
 
@@ -72,26 +223,37 @@ class BaseFactoryProvider(BaseProvider[T]):
         Positional arguments are appended after Factory positional dependencies.
         Keyword arguments have the priority over the Factory keyword dependencies with the same name.
         """
-        resolved_args, resolved_kwargs = resolve_provider_args(
-            *self._args,
-            **self._kwargs,
-        )
-        resolved_kwargs.update(kwargs)
-        instance = self._factory(*resolved_args, *args, **resolved_kwargs)
-        return cast(T, instance)
+        if not args and not kwargs:
+            session = get_resolution_session()
 
-    def has_async_dependencies(self) -> bool:
-        dependencies = self.get_dependencies()
+            if session is not None:
+                return self._resolve_in_session(session)
+
+            compiled = self._compiled
 
-        for provider in dependencies:
-            if not isinstance(provider, BaseFactoryProvider):
-                continue
+            if compiled is not None:
+                return cast(T, compiled())
 
-            if provider._is_async_factory:
-                return True
+            return cast(T, self._get_plan().build())
 
-        return False
+        instance = self._get_plan().resolve(args, kwargs)
+        return cast(T, instance)
+
+    def _resolve_in_session(self, session: ResolutionSession) -> T:
+        """Compiled resolving is skipped, it does not use session for inlined providers"""
+        if not self._memoized_in_session:
+            return cast(T, self._get_plan().build())
+
+        try:
+            return cast(T, session[self])
+        except KeyError:
+            instance = session[self] = self._get_plan().build()
+            return cast(T, instance)
+
+    def has_async_dependencies(self) -> bool:
+        """Some of transitive dependencies is resolved with await"""
+        return any(dependency.requires_async for dependency in self.get_dependencies())
 
     @property
     def should_be_async_resolved(self) -> bool:
-        return self._is_async_factory or self.has_async_dependencies()
+        return self.requires_async
@@ -13,6 +13,8 @@ T = TypeVar("T")
 
 
 class Coroutine(BaseFactoryProvider[T]):
+    __slots__ = ()
+
     def __init__(
         self,
         factory: Callable[P, Awaitable[T]],
@@ -21,6 +23,6 @@ class Coroutine(BaseFactoryProvider[T]):
     ) -> None:
         super().__init__(factory, *a, **kw)
 
-    def __call__(self, *_: Any, **__: Any) -> NoReturn:
+    def _resolve(self, *_: Any, **__: Any) -> NoReturn:
         msg = "Coroutine provider cannot be resolved synchronously"
         raise RuntimeError(msg)
@@ -8,6 +8,8 @@ T = TypeVar("T")
 
 
 class Object(BaseProvider[T]):
+    __slots__ = ("_value",)
+
     def __init__(self, value: T) -> None:
         super().__init__()
         self._value = value
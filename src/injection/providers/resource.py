@@ -1,5 +1,6 @@
 import inspect
 import sys
+import threading
 from contextlib import asynccontextmanager, contextmanager
 from typing import (
     Any,
@@ -16,8 +17,9 @@ from typing import (
     cast,
 )
 
-from injection.providers.base_factory import BaseFactoryProvider
-from injection.resolving import resolve_provider_args, resolve_provider_args_async
+from injection.providers.base_factory import BaseFactoryProvider, PendingByLoop
+from injection.resolving import ResolutionPlan
+from injection.scope import get_function_scope
 
 if sys.version_info < (3, 10):
     from typing_extensions import ParamSpec
@@ -74,7 +76,19 @@ def _create_context_factory(
 _resource_not_initialized_error_msg: Final[str] = "Resource is not initialized"
 
 
+class _ResourceState:
+    __slots__ = ("context", "initialized", "instance", "pending")
+
+    def __init__(self) -> None:
+        self.context: Any = None
+        self.initialized = False
+        self.instance: Any = None
+        self.pending: Optional[PendingByLoop] = None
+
+
 class Resource(BaseFactoryProvider[T]):
+    __slots__ = ("_context_factory", "_function_scope", "_lock", "_state")
+
     def __init__(  # type: ignore[valid-type]
         self,
         factory: Callable[
@@ -90,30 +104,51 @@ class Resource(BaseFactoryProvider[T]):
         function_scope: bool = False,
         **kwargs: P.kwargs,
     ) -> None:
+        # State is required by base class initialization
+        self._function_scope = function_scope
+        self._state = _ResourceState()
         super().__init__(factory, *args, **kwargs)  # type: ignore[arg-type]
         self._context_factory, self._is_async_factory = _create_context_factory(factory)
-        self._context: Any = None
-        self._initialized = False
-        self._instance: Optional[T] = None
-        self._function_scope = function_scope
-
-    def __create_context(self) -> None:
-        resolved_args, resolved_kwargs = resolve_provider_args(
-            *self._args,
-            **self._kwargs,
+        self._lock = threading.RLock()
+
+    def _create_plan(self) -> ResolutionPlan:
+        return ResolutionPlan(
+            self._context_factory,
+            self._args,
+            self._kwargs,
+            concurrent=self._concurrent,
         )
-        self._context = self._context_factory(*resolved_args, **resolved_kwargs)
 
-    async def __create_async_context(self) -> None:
-        resolved_args, resolved_kwargs = await resolve_provider_args_async(
-            *self._args,
-            **self._kwargs,
-        )
-        self._context = self._context_factory(*resolved_args, **resolved_kwargs)
+    def _get_state(self) -> _ResourceState:
+        """Function scope resource has own state in each injected call"""
+        if self._function_scope:
+            scope = get_function_scope()
+
+            if scope is not None:
+                state = scope.get(self)
+
+                if state is None:
+                    state = scope[self] = _ResourceState()
+
+                return cast(_ResourceState, state)
+
+        return self._state
+
+    @property
+    def _context(self) -> Any:
+        return self._get_state().context
+
+    @property
+    def _pending(self) -> Optional[PendingByLoop]:
+        return self._get_state().pending
+
+    @_pending.setter
+    def _pending(self, pending: Optional[PendingByLoop]) -> None:
+        self._get_state().pending = pending
 
     @property
     def initialized(self) -> bool:
-        return self._initialized
+        return self._get_state().initialized
 
     @property
     def function_scope(self) -> bool:
@@ -121,41 +156,65 @@ class Resource(BaseFactoryProvider[T]):
 
     @property
     def instance(self) -> Optional[T]:
-        return self._instance
+        return cast(Optional[T], self._get_state().instance)
+
+    def _is_resolved(self) -> bool:
+        return self.initialized or super()._is_resolved()
 
-    def _reset(self) -> None:
-        self._context = None
-        self._instance = None
-        self._initialized = False
+    @staticmethod
+    def _reset(state: _ResourceState) -> None:
+        state.context = None
+        state.instance = None
+        state.initialized = False
 
     def _resolve(self) -> T:
-        if self.initialized:
-            return cast(T, self.instance)
+        state = self._get_state()
 
-        self.__create_context()
-        self._instance = self._context.__enter__()
-        self._initialized = True
-        return cast(T, self.instance)
+        if state.initialized:
+            return cast(T, state.instance)
+
+        # Resource is initialized by one of concurrent threads, others wait for it
+        with self._lock:
+            if not state.initialized:
+                state.context = self._get_plan().resolve((), {})
+                state.instance = state.context.__enter__()
+                state.initialized = True
+
+        return cast(T, state.instance)
 
     def close(self) -> None:
-        if not self._initialized:
-            raise RuntimeError(_resource_not_initialized_error_msg)
+        state = self._get_state()
 
-        self._context.__exit__(None, None, None)
-        self._reset()
+        with self._lock:
+            if not state.initialized:
+                raise RuntimeError(_resource_not_initialized_error_msg)
+
+            state.context.__exit__(None, None, None)
+            self._reset(state)
 
     async def _async_resolve(self) -> T:
-        if self.initialized:
-            return cast(T, self.instance)
+        state = self._get_state()
+
+        if state.initialized:
+            return cast(T, state.instance)
+
+        return await self._async_resolve_once(self.__async_initialize)
 
-        await self.__create_async_context()
-        self._instance = await self._context.__aenter__()
-        self._initialized = True
-        return cast(T, self.instance)
+    async def __async_initialize(self) -> T:
+        state = self._get_state()
+
+        if not state.initialized:
+            state.context = await self._get_plan().async_resolve((), {})
+            state.instance = await state.context.__aenter__()
+            state.initialized = True
+
+        return cast(T, state.instance)
 
     async def async_close(self) -> None:
-        if not self._initialized:
+        state = self._get_state()
+
+        if not state.initialized:
             raise RuntimeError(_resource_not_initialized_error_msg)
 
-        await self._context.__aexit__(None, None, None)
-        self._reset()
+        await state.context.__aexit__(None, None, None)
+        self._reset(state)
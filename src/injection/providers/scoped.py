@@ -0,0 +1,63 @@
+import sys
+from typing import Any, Callable, ClassVar, TypeVar, cast
+
+if sys.version_info < (3, 10):
+    from typing_extensions import ParamSpec
+else:
+    from typing import ParamSpec
+
+from injection.providers.base_factory import BaseFactoryProvider
+from injection.scope import RequestScope, get_request_scope
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def _get_request_scope() -> RequestScope:
+    scope = get_request_scope()
+
+    if scope is None:
+        msg = (
+            "Scoped provider can be resolved only inside of request scope, "
+            "use @inject or injection.request_scope()"
+        )
+        raise RuntimeError(msg)
+
+    return scope
+
+
+class Scoped(BaseFactoryProvider[T]):
+    """Object created once per request scope"""
+
+    __slots__ = ()
+
+    # Injected calls enter request scope only when some Scoped provider exists
+    is_used: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        factory: Callable[P, T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> None:
+        super().__init__(factory, *args, **kwargs)
+        Scoped.is_used = True
+
+    def _resolve(self, *args: Any, **kwargs: Any) -> T:
+        scope = _get_request_scope()
+
+        try:
+            return cast(T, scope[self])
+        except KeyError:
+            instance = scope[self] = super()._resolve(*args, **kwargs)
+            return instance
+
+    async def _async_resolve(self, *args: Any, **kwargs: Any) -> T:
+        scope = _get_request_scope()
+
+        try:
+            return cast(T, scope[self])
+        except KeyError:
+            instance = await super()._async_resolve(*args, **kwargs)
+            # Object could be created by concurrent task of the same request
+            return cast(T, scope.setdefault(self, instance))
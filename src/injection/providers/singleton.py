@@ -1,4 +1,6 @@
 import sys
+import threading
+from functools import partial
 from typing import Any, Callable, Optional, TypeVar
 
 if sys.version_info < (3, 10):
@@ -15,6 +17,8 @@ T = TypeVar("T")
 class Singleton(BaseFactoryProvider[T]):
     """Object created only once"""
 
+    __slots__ = ("_instance", "_lock")
+
     def __init__(
         self,
         factory: Callable[P, T],
@@ -23,20 +27,47 @@ class Singleton(BaseFactoryProvider[T]):
     ) -> None:
         super().__init__(factory, *args, **kwargs)
         self._instance: Optional[T] = None
+        self._lock = threading.RLock()
 
     def _resolve(self, *args: Any, **kwargs: Any) -> T:
+        instance = self._instance
+
+        if instance is None:
+            # Object is created by one of concurrent threads, others wait for it
+            with self._lock:
+                instance = self._instance
+
+                if instance is None:
+                    instance = super()._resolve(*args, **kwargs)
+                    self._instance = instance
+                    self._reset_dependent_plans()
+
+        return instance
+
+    async def _async_resolve(self, *args: Any, **kwargs: Any) -> T:
         if self._instance is None:
-            instance = super()._resolve(*args, **kwargs)
-            self._instance = instance
+            return await self._async_resolve_once(
+                partial(self._async_create, *args, **kwargs),
+            )
 
         return self._instance
 
-    async def _async_resolve(self, *args: Any, **kwargs: Any) -> T:
+    async def _async_create(self, *args: Any, **kwargs: Any) -> T:
         if self._instance is None:
             instance = await super()._async_resolve(*args, **kwargs)
             self._instance = instance
+            self._reset_dependent_plans()
 
         return self._instance
 
+    def _is_resolved(self) -> bool:
+        return self._instance is not None or super()._is_resolved()
+
+    def _get_constant(self) -> Any:
+        """Created object is embedded into plans of dependents until reset"""
+        return None if self._has_overrides() else self._instance
+
     def reset(self) -> None:
-        self._instance = None
+        if self._instance is not None:
+            self._instance = None
+            self._reset_dependent_plans()
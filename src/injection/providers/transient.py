@@ -15,6 +15,10 @@ T = TypeVar("T")
 class Transient(BaseFactoryProvider[T]):
     """Object that needs to be created every time"""
 
+    __slots__ = ()
+
+    _memoized_in_session = True
+
     def __init__(
         self,
         factory: Callable[P, T],
@@ -1,88 +1,355 @@
-from typing import Any, Dict, List, Tuple, TypeVar, Union
+import asyncio
+import keyword
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from injection.provided import ProvidedInstance
 from injection.providers.base import BaseProvider
 
 T = TypeVar("T")
 
+SyncResolver = Callable[[], Any]
+AsyncResolver = Callable[[], Awaitable[Any]]
+# (value, sync resolver, async resolver): resolvers are None for constant values,
+# async resolver is None when value is resolved without await
+Slot = Tuple[Any, Optional[SyncResolver], Optional[AsyncResolver]]
 
-def _resolve_value(
-    value: Union[ProvidedInstance, BaseProvider[T], Any],
-) -> Any:
-    if isinstance(value, ProvidedInstance):
-        value = value.get_value()
 
+def _is_dependency(value: Any) -> bool:
+    return isinstance(value, (ProvidedInstance, BaseProvider))
+
+
+def _fold_constant(value: Any) -> Any:
+    """Resolved singleton is replaced with its object"""
     if isinstance(value, BaseProvider):
-        value = value()
+        constant = value._get_constant()
+
+        if constant is not None and not _is_dependency(constant):
+            return constant
 
     return value
 
 
-async def _resolve_value_async(
+def _compile_slot(
     value: Union[ProvidedInstance, BaseProvider[T], Any],
-) -> Any:
+) -> Slot:
     if isinstance(value, ProvidedInstance):
-        value = value.get_value()
+        async_getter = value.async_get_value if value._provided.requires_async else None
+        return value, value.get_value, async_getter
 
     if isinstance(value, BaseProvider):
-        value = await value.async_resolve()
+        # Dependencies without async ones in their graph are resolved synchronously
+        return value, value, value.async_resolve if value.requires_async else None
+
+    return value, None, None
+
+
+async def _resolve_slot_async(slot: Slot) -> Any:
+    value, resolver, async_resolver = slot
+
+    if async_resolver is not None:
+        return await async_resolver()
+
+    if resolver is not None:
+        return resolver()
 
     return value
 
 
-def _resolve_positional_args(*args: Any) -> List[Any]:
-    clean_args = []
+def _get_provider(
+    value: Union[ProvidedInstance, BaseProvider[Any]],
+) -> BaseProvider[Any]:
+    return value._provided if isinstance(value, ProvidedInstance) else value
+
+
+def _get_async_closure(provider: BaseProvider[Any]) -> Set[BaseProvider[Any]]:
+    """Provider and its transitive dependencies which are resolved with await"""
+    closure: Set[BaseProvider[Any]] = set()
+    providers = [provider]
+
+    while providers:
+        current = providers.pop()
+
+        if current in closure or not current.requires_async:
+            continue
+
+        closure.add(current)
+        providers.extend(current.get_dependencies())
+
+    return closure
+
+
+def _are_independent(providers: List[BaseProvider[Any]]) -> bool:
+    """Providers do not share any dependency which is resolved with await"""
+    visited: Set[BaseProvider[Any]] = set()
+
+    for provider in providers:
+        closure = _get_async_closure(provider)
+
+        if not visited.isdisjoint(closure):
+            return False
+
+        visited.update(closure)
+
+    return True
+
+
+async def _resolve_slots_concurrently(slots: Tuple[Slot, ...]) -> List[Any]:
+    """
+    Sync and already resolved dependencies are resolved in place,
+    others are resolved concurrently in order of slots.
+    """
+    values: List[Any] = []
+    pending_positions = []
+    pending = []
+
+    for value, resolver, async_resolver in slots:
+        if async_resolver is None:
+            values.append(value if resolver is None else resolver())
+        elif _get_provider(value)._is_resolved():
+            values.append(await async_resolver())
+        else:
+            values.append(None)
+            pending_positions.append(len(values) - 1)
+            pending.append(async_resolver)
+
+    if len(pending) == 1:
+        values[pending_positions[0]] = await pending[0]()
+    elif pending:
+        results = await asyncio.gather(
+            *[async_resolver() for async_resolver in pending],
+            return_exceptions=True,
+        )
+
+        for position, result in zip(pending_positions, results):
+            if isinstance(result, BaseException):
+                raise result
+
+            values[position] = result
+
+    return values
+
+
+def _build_with_no_dependencies(factory: Callable[..., Any]) -> SyncResolver:
+    return factory
+
+
+def _build_with_one(factory: Callable[..., Any], first: SyncResolver) -> SyncResolver:
+    return lambda: factory(first())
+
+
+def _build_with_two(
+    factory: Callable[..., Any],
+    first: SyncResolver,
+    second: SyncResolver,
+) -> SyncResolver:
+    return lambda: factory(first(), second())
+
+
+def _build_with_three(
+    factory: Callable[..., Any],
+    first: SyncResolver,
+    second: SyncResolver,
+    third: SyncResolver,
+) -> SyncResolver:
+    return lambda: factory(first(), second(), third())
+
+
+# Number of positional dependencies -> builder of the resolver
+_POSITIONAL_BUILDERS: Dict[int, Callable[..., SyncResolver]] = {
+    0: _build_with_no_dependencies,
+    1: _build_with_one,
+    2: _build_with_two,
+    3: _build_with_three,
+}
+
+
+def _is_keyword(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def _generate_builder(
+    factory: Callable[..., Any],
+    args: Tuple[Slot, ...],
+    kwargs: Tuple[Tuple[str, Slot], ...],
+) -> SyncResolver:
+    """
+    Generates a function which calls the factory with dependencies as arguments.
+    Constants bound with partial are passed by the function too,
+    because partial copies its keywords when it is called with keywords.
+    """
+    namespace: Dict[str, Any] = {}
+    constant_args: Tuple[Any, ...] = ()
+    constant_kwargs: Dict[str, Any] = {}
+
+    if type(factory) is partial and factory.keywords.keys().isdisjoint(
+        name for name, _ in kwargs
+    ):
+        constant_args = factory.args
+        constant_kwargs = factory.keywords
+        factory = factory.func
+
+    def bind(value: Any) -> str:
+        name = f"_v{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    factory_name = bind(factory)
+    arguments = [bind(value) for value in constant_args]
+    arguments.extend(
+        bind(value) if resolver is None else f"{bind(resolver)}()"
+        for value, resolver, _ in args
+    )
+    keywords = [(name, bind(value)) for name, value in constant_kwargs.items()]
+    keywords.extend((name, f"{bind(resolver)}()") for name, (_, resolver, _) in kwargs)
+    arguments.extend(f"{name}={value}" for name, value in keywords if _is_keyword(name))
+    # Names which are not identifiers can be passed only with mapping
+    unpacked = [
+        f"{name!r}: {value}" for name, value in keywords if not _is_keyword(name)
+    ]
 
-    for value_or_provider in args:
-        resolved_value = _resolve_value(value_or_provider)
-        clean_args.append(resolved_value)
+    if unpacked:
+        arguments.append(f"**{{{', '.join(unpacked)}}}")
 
-    return clean_args
+    source = f"lambda: {factory_name}({', '.join(arguments)})"
+    return cast(SyncResolver, eval(source, namespace))  # noqa: S307
 
 
-def _resolve_kwargs(**kwargs: Any) -> Dict[str, Any]:
-    clean_kwargs = {}
+def _specialize(
+    factory: Callable[..., Any],
+    args: Tuple[Slot, ...],
+    kwargs: Tuple[Tuple[str, Slot], ...],
+) -> SyncResolver:
+    """
+    Builds resolver without call arguments for the shape of dependencies.
+    The factory is called with resolved values directly,
+    without intermediate list and dict of arguments.
+    """
+    resolvers = [resolver for _, resolver, _ in args if resolver is not None]
 
-    for arg, value in kwargs.items():
-        resolved_value = _resolve_value(value)
-        clean_kwargs[arg] = resolved_value
+    # Common positional shapes don't need generated code
+    if not kwargs and len(resolvers) == len(args):
+        builder = _POSITIONAL_BUILDERS.get(len(resolvers))
 
-    return clean_kwargs
+        if builder is not None:
+            return builder(factory, *resolvers)
 
+    return _generate_builder(factory, args, kwargs)
 
-async def _resolve_positional_args_async(*args: Any) -> List[Any]:
-    resolved_args = []
 
-    for value_or_provider in args:
-        resolved_value = await _resolve_value_async(value_or_provider)
-        resolved_args.append(resolved_value)
+class ResolutionPlan:
+    """
+    Arguments of the provider classified once.
+    Constant arguments and objects of resolved singletons
+    are bound to the factory with partial,
+    dependencies are kept as callables that are invoked on each resolving.
+    """
 
-    return resolved_args
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        *,
+        concurrent: bool = False,
+    ) -> None:
+        args = tuple(_fold_constant(value) for value in args)
+        kwargs = {name: _fold_constant(value) for name, value in kwargs.items()}
+        leading_constants_count = 0
 
+        for value in args:
+            if _is_dependency(value):
+                break
+            leading_constants_count += 1
 
-async def _resolve_kwargs_async(**kwargs: Any) -> Dict[str, Any]:
-    resolved_kwargs = {}
+        constant_args = args[:leading_constants_count]
+        constant_kwargs = {
+            name: value for name, value in kwargs.items() if not _is_dependency(value)
+        }
 
-    for arg, value_or_provider in kwargs.items():
-        resolved_value = await _resolve_value_async(value_or_provider)
-        resolved_kwargs[arg] = resolved_value
+        if constant_args or constant_kwargs:
+            factory = partial(factory, *constant_args, **constant_kwargs)
 
-    return resolved_kwargs
+        self.factory = factory
+        self.args = tuple(
+            _compile_slot(value) for value in args[leading_constants_count:]
+        )
+        self.kwargs = tuple(
+            (name, _compile_slot(value))
+            for name, value in kwargs.items()
+            if _is_dependency(value)
+        )
+        # Opted in async dependencies without shared async subgraphs are resolved concurrently
+        async_dependencies = [
+            _get_provider(value)
+            for value, _, async_resolver in (
+                *self.args,
+                *(slot for _, slot in self.kwargs),
+            )
+            if concurrent and async_resolver is not None
+        ]
+        self.concurrent = len(async_dependencies) > 1 and _are_independent(
+            async_dependencies,
+        )
+        # Resolving without call arguments, which is the most common
+        self.build = _specialize(self.factory, self.args, self.kwargs)
 
+    def resolve(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """
+        Positional arguments are appended after positional dependencies.
+        Keyword arguments have the priority over the keyword dependencies with the same name.
+        """
+        resolved_args = [
+            value if resolver is None else resolver()
+            for value, resolver, _ in self.args
+        ]
+        resolved_kwargs = {
+            name: resolver()
+            for name, (_, resolver, _) in self.kwargs
+            if resolver is not None
+        }
+        resolved_kwargs.update(kwargs)
+        return self.factory(*resolved_args, *args, **resolved_kwargs)
 
-def resolve_provider_args(
-    *args: Any,
-    **kwargs: Any,
-) -> Tuple[List[Any], Dict[str, Any]]:
-    resolved_args = _resolve_positional_args(*args)
-    resolved_kwargs = _resolve_kwargs(**kwargs)
-    return resolved_args, resolved_kwargs
+    async def async_resolve(
+        self,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        if self.concurrent:
+            return await self._async_resolve_concurrently(args, kwargs)
 
+        resolved_args = [await _resolve_slot_async(slot) for slot in self.args]
+        resolved_kwargs = {
+            name: await _resolve_slot_async(slot) for name, slot in self.kwargs
+        }
+        resolved_kwargs.update(kwargs)
+        return self.factory(*resolved_args, *args, **resolved_kwargs)
 
-async def resolve_provider_args_async(
-    *args: Any,
-    **kwargs: Any,
-) -> Tuple[List[Any], Dict[str, Any]]:
-    resolved_args = await _resolve_positional_args_async(*args)
-    resolved_kwargs = await _resolve_kwargs_async(**kwargs)
-    return resolved_args, resolved_kwargs
+    async def _async_resolve_concurrently(
+        self,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        values = await _resolve_slots_concurrently(
+            (*self.args, *(slot for _, slot in self.kwargs)),
+        )
+        args_count = len(self.args)
+        resolved_args = values[:args_count]
+        resolved_kwargs = {
+            name: value for (name, _), value in zip(self.kwargs, values[args_count:])
+        }
+        resolved_kwargs.update(kwargs)
+        return self.factory(*resolved_args, *args, **resolved_kwargs)
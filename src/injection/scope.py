@@ -0,0 +1,96 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, Optional
+
+# Objects bound to the current injected call, e.g. states of function scope resources
+FunctionScope = Dict[Any, Any]
+# Objects of Scoped providers created in the current request
+RequestScope = Dict[Any, Any]
+# Objects of Factory and Transient providers created in the current resolution
+ResolutionSession = Dict[Any, Any]
+
+_function_scope: "ContextVar[Optional[FunctionScope]]" = ContextVar(
+    "injection_function_scope",
+    default=None,
+)
+
+
+def get_function_scope() -> Optional[FunctionScope]:
+    """Scope of the current injected call, None outside of injected calls"""
+    return _function_scope.get()
+
+
+def enter_function_scope() -> "Token[Optional[FunctionScope]]":
+    """Starts new scope, which is isolated from scopes of concurrent calls"""
+    return _function_scope.set({})
+
+
+def exit_function_scope(token: "Token[Optional[FunctionScope]]") -> None:
+    _function_scope.reset(token)
+
+
+_request_scope: "ContextVar[Optional[RequestScope]]" = ContextVar(
+    "injection_request_scope",
+    default=None,
+)
+
+
+def get_request_scope() -> Optional[RequestScope]:
+    """Active request scope, None outside of request scopes"""
+    return _request_scope.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Objects of Scoped providers are created once inside of the scope"""
+    token = _request_scope.set({})
+
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+_resolution_session: "ContextVar[Optional[ResolutionSession]]" = ContextVar(
+    "injection_resolution_session",
+    default=None,
+)
+
+
+class _ResolutionSessions:
+    """Counts active sessions of all threads, so providers skip context lookup without them"""
+
+    active = 0
+    lock = threading.Lock()
+
+
+def get_resolution_session() -> Optional[ResolutionSession]:
+    """Active resolution session, None outside of resolution sessions"""
+    if not _ResolutionSessions.active:
+        return None
+    return _resolution_session.get()
+
+
+@contextmanager
+def resolution_session() -> Iterator[None]:
+    """
+    Factory and Transient providers called without arguments
+    create their objects once inside of the session, nested sessions join the outer one.
+    """
+    if get_resolution_session() is not None:
+        yield
+        return
+
+    with _ResolutionSessions.lock:
+        _ResolutionSessions.active += 1
+
+    token = _resolution_session.set({})
+
+    try:
+        yield
+    finally:
+        _resolution_session.reset(token)
+
+        with _ResolutionSessions.lock:
+            _ResolutionSessions.active -= 1
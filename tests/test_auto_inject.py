@@ -82,19 +82,18 @@ async def test_auto_inject_expect_error_on_duplicated_provider_types() -> None:
     async def _async_func(a: Any, b: Any, _: Service) -> Tuple[Any, Any]:
         return a, b
 
-    _mock_providers = [Container.__dict__["service"]]
-    _mock_providers.extend(
-        Container.get_providers(),
-    )
-
+    # Simulate a duplicate 'service' provider
     with mock.patch.object(
         Container,
-        "get_providers",
-        return_value=_mock_providers,
+        "service_copy",
+        providers.Factory(Service),
+        create=True,
     ):
         with pytest.raises(DuplicatedFactoryTypeAutoInjectionError):
             await _async_func(a=234, b="rnd")  # type: ignore[call-arg]
 
+    assert isinstance(await _async_func(a=234, b="rnd"), tuple)  # type: ignore[call-arg]
+
 
 def test_auto_injection_with_args_overriding() -> None:
     @auto_inject(target_container=Container)
@@ -343,3 +342,83 @@ async def test_auto_inject_sync_provider_with_async_dependency() -> None:
 
     result = await _func()  # type: ignore[call-arg]
     assert result == 13
+
+
+def test_auto_inject_resolves_string_annotations_on_first_call() -> None:
+    @auto_inject(target_container=Container)
+    def func(service: "Service") -> Service:
+        return service
+
+    assert isinstance(func(), Service)  # type: ignore[call-arg]
+
+
+def test_auto_inject_skips_only_unresolvable_string_annotations() -> None:
+    @auto_inject(target_container=Container)
+    def func(
+        service: "Service",
+        value: "TypeCheckingOnly" = None,  # type: ignore[name-defined] # noqa: F821
+    ) -> Service:
+        assert value is None
+        return service
+
+    assert isinstance(func(), Service)  # type: ignore[call-arg]
+
+
+def test_auto_inject_looks_up_providers_by_type_once() -> None:
+    @auto_inject(target_container=Container)
+    def func(service: Service, value: int = 1) -> Service:  # noqa: ARG001
+        return service
+
+    with mock.patch.object(
+        Container,
+        "get_provider_by_type",
+        wraps=Container.get_provider_by_type,
+    ) as get_provider_by_type:
+        func()  # type: ignore[call-arg]
+        func()  # type: ignore[call-arg]
+        func(Service())
+
+    get_provider_by_type.assert_called_once_with(Service)
+
+
+def test_auto_inject_with_resolution_session() -> None:
+    class _Pair:
+        def __init__(self, first: Service, second: Service) -> None:
+            self.first = first
+            self.second = second
+
+    class _Container(DeclarativeContainer):
+        service = providers.Factory(Service)
+        pair = providers.Factory(_Pair, service.cast, service.cast)
+
+    @auto_inject(target_container=_Container, resolution_session=True)
+    def func(pair: _Pair, service: Service) -> Tuple[_Pair, Service]:
+        return pair, service
+
+    pair, service = func()  # type: ignore[call-arg]
+
+    assert pair.first is pair.second is service
+
+
+async def test_auto_injection_returns_created_objects_without_await() -> None:
+    async def _create_service() -> Service:
+        return Service(a=5)
+
+    class _Container(DeclarativeContainer):
+        service = providers.Singleton(_create_service)
+
+    @auto_inject(target_container=_Container)
+    async def _inner(service: Service) -> int:
+        return service.a
+
+    assert await _inner() == 5  # type: ignore[call-arg]
+
+    with mock.patch.object(
+        providers.Singleton,
+        "async_resolve",
+        side_effect=AssertionError,
+    ):
+        assert await _inner() == 5  # type: ignore[call-arg]
+
+        with _Container.service.override_context(Service(a=6)):
+            assert await _inner() == 6  # type: ignore[call-arg]
@@ -1,13 +1,20 @@
-from typing import Type
+import asyncio
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import AsyncIterator, Iterator, Protocol, Type, runtime_checkable
 from unittest import mock
 from unittest.mock import Mock
 
 import pytest
 
-from injection.exceptions import DuplicatedFactoryTypeAutoInjectionError
+from injection import DeclarativeContainer, providers
+from injection.exceptions import (
+    DuplicatedFactoryTypeAutoInjectionError,
+    UnknownProviderTypeAutoInjectionError,
+)
 from injection.providers.base import BaseProvider
 from injection.providers.singleton import Singleton
-from tests.container_objects import Container, Redis
+from tests.container_objects import Container, Redis, Settings
 
 
 def test_get_providers(container: Type[Container]) -> None:
@@ -55,6 +62,20 @@ def test_override_providers_success(container: Type[Container]) -> None:
     assert container.num() == 1234
 
 
+async def test_override_providers_local_in_concurrent_tasks(
+    container: Type[Container],
+) -> None:
+    async def _run(num: int) -> int:
+        with container.override_providers({"num": num}, local=True):
+            await asyncio.sleep(0)
+            return container.num()
+
+    first, second = await asyncio.gather(_run(1), _run(2))
+
+    assert (first, second) == (1, 2)
+    assert container.num() == 1234
+
+
 def test_container_instance_is_singleton(container: Type[Container]) -> None:
     instances = [container.instance() for _ in range(10)]
     instance_ids = {id(instance) for instance in instances}
@@ -118,19 +139,131 @@ def test_resolve_by_type_expect_error_on_duplicated_provider_types(
     container: Type[Container],
 ) -> None:
     # Simulate a duplicate 'redis' provider
-    _mock_providers = [container.__dict__["redis"]]
-    _mock_providers.extend(
-        container.get_providers(),
-    )
-
     with mock.patch.object(
         container,
-        "get_providers",
-        return_value=_mock_providers,
+        "redis_copy",
+        Singleton(Redis, url="redis://copy", port=1),
+        create=True,
     ):
         with pytest.raises(DuplicatedFactoryTypeAutoInjectionError):
             container.resolve_by_type(Redis)
 
+    assert isinstance(container.resolve_by_type(Redis), Redis)
+
+
+def test_resolve_by_type_uses_type_index(container: Type[Container]) -> None:
+    index = container._get_type_index()
+
+    assert index[Redis] is container.redis
+    assert container._get_type_index() is index
+    assert container.get_provider_by_type(Redis) is container.redis
+
+
+def test_type_index_invalidated_on_new_provider() -> None:
+    class _Container(DeclarativeContainer):
+        redis = providers.Singleton(Redis, url="redis://localhost", port=1)
+
+    assert _Container.get_provider_by_type(Redis) is _Container.redis
+
+    settings_provider = providers.Factory(Settings)
+    _Container.settings = settings_provider
+    assert _Container.get_provider_by_type(Settings) is settings_provider
+
+    del _Container.settings  # type: ignore[attr-defined]
+    with pytest.raises(UnknownProviderTypeAutoInjectionError):
+        _Container.get_provider_by_type(Settings)
+
+
+def test_type_index_of_child_container_is_not_shared() -> None:
+    class _Container(DeclarativeContainer):
+        redis = providers.Singleton(Redis, url="redis://localhost", port=1)
+
+    class _ChildContainer(_Container):
+        settings = providers.Factory(Settings)
+
+    assert _Container.get_provider_by_type(Redis) is _Container.redis
+    assert _ChildContainer.get_provider_by_type(Settings) is _ChildContainer.settings
+    assert _ChildContainer.get_provider_by_type(Redis) is _Container.redis
+
+    with pytest.raises(UnknownProviderTypeAutoInjectionError):
+        _Container.get_provider_by_type(Settings)
+
+
+def test_registry_merges_providers_of_base_containers() -> None:
+    def _resource() -> Iterator[int]:
+        yield 1
+
+    class _Container(DeclarativeContainer):
+        redis = providers.Singleton(Redis, url="redis://localhost", port=1)
+        num = providers.Object(1)
+
+    class _ChildContainer(_Container):
+        num = providers.Object(2)
+        settings = providers.Factory(Settings)
+        resource = providers.Resource(_resource)
+
+    registry = _ChildContainer.get_registry()
+
+    assert registry.by_name == {
+        "num": _ChildContainer.num,
+        "redis": _Container.redis,
+        "resource": _ChildContainer.resource,
+        "settings": _ChildContainer.settings,
+    }
+    assert registry.singletons == (_Container.redis,)
+    assert registry.resources == (_ChildContainer.resource,)
+    assert registry.factories == (
+        _Container.redis,
+        _ChildContainer.resource,
+        _ChildContainer.settings,
+    )
+    assert _ChildContainer.get_registry() is registry
+
+
+def test_registry_of_child_container_updated_on_base_changes() -> None:
+    class _Container(DeclarativeContainer):
+        num = providers.Object(1)
+
+    class _ChildContainer(_Container):
+        pass
+
+    settings_provider = providers.Factory(Settings)
+    _Container.settings = settings_provider
+
+    assert _ChildContainer.get_providers() == [_Container.num, settings_provider]
+
+    _ChildContainer.num = None  # type: ignore[assignment]
+
+    assert _ChildContainer.get_providers() == [settings_provider]
+    assert _Container.get_providers() == [_Container.num, settings_provider]
+
+    del _ChildContainer.num
+
+    assert _ChildContainer.get_providers() == [_Container.num, settings_provider]
+
+
+def test_abstract_container_with_abc_base() -> None:
+    class _BaseContainer(DeclarativeContainer, ABC):
+        num = providers.Object(1)
+
+        @classmethod
+        @abstractmethod
+        def name(cls) -> str: ...
+
+    class _Container(_BaseContainer):
+        settings = providers.Factory(Settings)
+
+        @classmethod
+        def name(cls) -> str:
+            return "container"
+
+    with pytest.raises(TypeError):
+        _BaseContainer()  # type: ignore[abstract]
+
+    assert isinstance(_Container.instance(), _BaseContainer)
+    assert _Container.name() == "container"
+    assert _Container.get_providers() == [_BaseContainer.num, _Container.settings]
+
 
 def test_sync_resources_lifecycle(container: Type[Container]) -> None:
     container.init_resources()
@@ -169,3 +302,118 @@ async def test_init_all_resources(container: Type[Container]) -> None:
 
     for provider in container.get_resource_providers():
         assert provider.initialized
+
+
+class _Repository(ABC):
+    @abstractmethod
+    def get(self) -> int: ...
+
+
+class _SqlRepository(_Repository):
+    def get(self) -> int:
+        return 1
+
+
+@runtime_checkable
+class _SupportsClose(Protocol):
+    def close(self) -> None: ...
+
+
+class _Session:
+    def close(self) -> None: ...
+
+
+class _Cache:
+    def get(self) -> int:
+        return 2
+
+
+def _session_resource() -> Iterator[_Session]:
+    yield _Session()
+
+
+async def _async_session_resource() -> AsyncIterator[_Session]:
+    yield _Session()
+
+
+def test_provider_by_type_found_by_base_class() -> None:
+    class _Container(DeclarativeContainer):
+        repository = providers.Factory(_SqlRepository)
+
+    assert _Container.get_provider_by_type(_Repository) is _Container.repository
+    assert _Container.get_provider_by_type(_SqlRepository) is _Container.repository
+
+
+def test_provider_by_type_found_by_return_annotation() -> None:
+    class _Container(DeclarativeContainer):
+        session = providers.Resource(_session_resource)
+
+    assert _Container.get_provider_by_type(_Session) is _Container.session
+
+
+def test_provider_by_type_found_by_async_return_annotation() -> None:
+    class _Container(DeclarativeContainer):
+        session = providers.Resource(_async_session_resource)
+
+    assert _Container.get_provider_by_type(_Session) is _Container.session
+
+
+def test_provider_by_type_found_by_declared_interface() -> None:
+    class _Container(DeclarativeContainer):
+        cache = providers.Singleton(_Cache).implements(_Repository)
+
+    assert _Container.cache.interfaces == (_Repository,)
+    assert _Container.get_provider_by_type(_Repository) is _Container.cache
+    assert _Container.get_provider_by_type(_Cache) is _Container.cache
+
+
+def test_provider_by_type_found_by_runtime_protocol() -> None:
+    class _Container(DeclarativeContainer):
+        session = providers.Factory(_Session)
+        repository = providers.Factory(_SqlRepository)
+
+    assert _Container.get_provider_by_type(_SupportsClose) is _Container.session
+    assert _Container._get_type_index()[_SupportsClose] is _Container.session
+
+
+def test_provider_by_type_direct_type_has_priority_over_base_class() -> None:
+    class _OtherSqlRepository(_SqlRepository): ...
+
+    class _Container(DeclarativeContainer):
+        repository = providers.Factory(_SqlRepository)
+        other_repository = providers.Factory(_OtherSqlRepository)
+
+    assert _Container.get_provider_by_type(_SqlRepository) is _Container.repository
+    assert (
+        _Container.get_provider_by_type(_OtherSqlRepository)
+        is _Container.other_repository
+    )
+
+    with pytest.raises(DuplicatedFactoryTypeAutoInjectionError):
+        _Container.get_provider_by_type(_Repository)
+
+
+def test_provider_by_type_skips_builtin_and_enum_bases() -> None:
+    class _Kind(str, Enum):
+        SQL = "sql"
+
+    class _Container(DeclarativeContainer):
+        kind_factory = providers.Factory(_Kind, "sql")
+        name = providers.Factory(str, "name")
+
+    assert _Container.get_provider_by_type(_Kind) is _Container.kind_factory
+    assert _Container.get_provider_by_type(str) is _Container.name
+
+    with pytest.raises(UnknownProviderTypeAutoInjectionError):
+        _Container.get_provider_by_type(Enum)
+
+
+def test_provider_by_type_caches_unknown_types() -> None:
+    class _Container(DeclarativeContainer):
+        repository = providers.Factory(_SqlRepository)
+
+    for _ in range(2):
+        with pytest.raises(UnknownProviderTypeAutoInjectionError):
+            _Container.get_provider_by_type(_Cache)
+
+    assert _Cache in _Container._get_type_index()
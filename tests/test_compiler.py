@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+from injection import DeclarativeContainer, providers
+from injection.compiler import compile_provider
+
+
+@dataclass
+class Settings:
+    url: str = "sqlite://"
+
+
+@dataclass
+class Engine:
+    url: str
+    pool_size: int
+
+
+@dataclass
+class Session:
+    engine: Engine
+    closed: bool = False
+
+
+@dataclass
+class DAO:
+    session: Session
+    limit: int
+
+
+def session_resource(engine: Engine) -> Iterator[Session]:
+    session = Session(engine)
+    yield session
+    session.closed = True
+
+
+class _Container(DeclarativeContainer):
+    settings = providers.Singleton(Settings)
+    limit = providers.Object(100)
+    engine = providers.Singleton(Engine, settings.provided.url, pool_size=20)  # type: ignore[arg-type]
+    session = providers.Factory(Session, engine=engine.cast)
+    dao = providers.Transient(DAO, session.cast, limit=limit.cast)
+    session_resource = providers.Resource(session_resource, engine=engine.cast)
+    resource_dao = providers.Factory(DAO, session=session_resource.cast, limit=1)
+
+
+def test_compile_provider_inlines_child_providers() -> None:
+    resolver = compile_provider(_Container.dao)
+    source = resolver.__source__  # type: ignore[attr-defined]
+
+    assert source.startswith("def _resolve():\n    return ")
+    assert "._instance is not None" in source
+
+    dao = resolver()
+    assert dao == DAO(Session(Engine("sqlite://", 20)), limit=100)
+    assert dao.session.engine is _Container.engine()
+
+
+def test_compile_provider_calls_resource_provider() -> None:
+    resolver = compile_provider(_Container.resource_dao)
+
+    dao = resolver()
+    assert dao.session is _Container.session_resource()
+    assert not dao.session.closed
+
+    _Container.session_resource.close()
+    assert dao.session.closed
+
+
+def test_container_compile() -> None:
+    _Container.compile()
+
+    assert _Container.dao._compiled is not None
+    assert _Container.session._compiled is not None
+    assert _Container.engine._compiled is not None
+
+    dao = _Container.dao()
+    assert dao.limit == 100
+    assert dao.session.engine is _Container.engine()
+    assert _Container.dao(limit=5).limit == 5
+
+
+def test_compiled_resolving_falls_back_on_overriding() -> None:
+    _Container.compile()
+
+    with _Container.limit.override_context(-1):
+        assert _Container.dao._compiled is None
+        assert _Container.session._compiled is not None
+        assert _Container.dao().limit == -1
+
+    assert _Container.dao().limit == 100
+
+
+def test_container_override_providers_recompiles() -> None:
+    _Container.compile()
+
+    with _Container.override_providers_kwargs(limit=-5):
+        assert _Container.dao._compiled is None
+        assert _Container.dao().limit == -5
+
+    assert _Container.dao._compiled is not None
+    assert _Container.dao().limit == 100
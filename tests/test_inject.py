@@ -1,9 +1,32 @@
-from typing import Type
+import inspect
+import sys
+from typing import Any, AsyncIterator, Iterator, List, Tuple, Type
+from unittest import mock
 
-from injection import Provide, inject
+from typing_extensions import Annotated
+
+from injection import (
+    DeclarativeContainer,
+    Provide,
+    inject,
+    providers,
+    resolution_session,
+)
+from injection.inject import (
+    _get_unplanned_parameters,
+    get_function_scope_resources,
+    get_injection_plan,
+)
 from tests.container_objects import Container, Service
 
 
+class _Depends:
+    """Dependency declaration of web frameworks"""
+
+    def __init__(self, dependency: Any) -> None:
+        self.dependency = dependency
+
+
 def test_injection_with_args_overriding(container: Type[Container]) -> None:
     @inject
     def _inner(
@@ -52,3 +75,276 @@ async def test_injection_async(container: Type[Container]) -> None:
         assert arg3 == 100
 
     await _inner(True)  # noqa: FBT003
+
+
+def test_injection_plan_contains_only_parameters_with_markers(
+    container: Type[Container],
+) -> None:
+    def _inner(
+        a: int,
+        b: Service = Provide[container.service],
+        *args: Any,
+        c: str = "c",
+        d: int = Provide[container.num],
+        e: Annotated[int, _Depends(Provide[container.num2])],
+        **kwargs: Any,
+    ) -> None: ...
+
+    plan = get_injection_plan(_inner, inspect.signature(_inner))
+
+    assert plan == (
+        (1, "b", container.service, False),
+        (sys.maxsize, "d", container.num, False),
+        (sys.maxsize, "e", container.num2, False),
+    )
+
+
+def test_injection_plan_skips_only_unresolvable_string_annotations() -> None:
+    def _inner(
+        a: "Annotated[int, _Depends(Provide[Container.num])]",
+        b: "TypeCheckingOnly",  # type: ignore[name-defined] # noqa: F821
+    ) -> None: ...
+
+    plan = get_injection_plan(_inner, inspect.signature(_inner))
+
+    assert plan == ((0, "a", Container.num, False),)
+
+
+def test_injection_looks_for_passed_markers_only_in_parameters_without_plan(
+    container: Type[Container],
+) -> None:
+    @inject
+    def _inner(
+        a: int,
+        /,
+        b: int = Provide[container.num],
+        c: int = 0,
+        *,
+        d: int = 0,
+        **kwargs: Any,
+    ) -> Tuple[Any, ...]:
+        return a, b, c, d, kwargs
+
+    marker: Any = Provide[container.num2]
+
+    signature = inspect.signature(_inner)
+    plan = get_injection_plan(_inner, signature)
+
+    assert _get_unplanned_parameters(signature, plan) == ("c", "d")
+    assert _inner(1, c=marker, d=marker, e=marker) == (
+        1,
+        1234,
+        9402,
+        9402,
+        {"e": marker},
+    )
+
+
+def test_injection_with_keyword_only_parameter_after_var_positional(
+    container: Type[Container],
+) -> None:
+    @inject
+    def _inner(*args: int, num: int = Provide[container.num]) -> Tuple[Any, ...]:
+        return (*args, num)
+
+    assert _inner(1, 2, 3) == (1, 2, 3, 1234)
+
+
+def test_injection_with_marker_passed_to_keyword_arguments(
+    container: Type[Container],
+) -> None:
+    @inject
+    def _inner(num: Annotated[int, _Depends(Provide[container.num])]) -> int:
+        return num
+
+    assert _inner(num=Provide[container.num]) == 1234
+    assert _inner(num=Provide[container.num2]) == 9402
+    assert _inner(num=5) == 5
+
+
+def test_injection_with_marker_wrapped_in_default_or_passed_for_plain_parameter(
+    container: Type[Container],
+) -> None:
+    @inject
+    def _wrapped(num: Any = _Depends(Provide[container.num])) -> Any:  # noqa: B008
+        return num
+
+    @inject
+    def _plain(num: int = 5) -> int:
+        return num
+
+    assert _wrapped() == 1234
+    assert _wrapped(num=Provide[container.num2]) == 9402
+    assert _plain() == 5
+    assert _plain(num=Provide[container.num]) == 1234
+
+
+async def test_async_injection_with_marker_passed_for_plain_parameter(
+    container: Type[Container],
+) -> None:
+    @inject
+    async def _plain(num: int = 5, coro: Any = None) -> Tuple[int, Any]:
+        return num, coro
+
+    assert await _plain(
+        num=Provide[container.num],
+        coro=Provide[container.coroutine_provider],
+    ) == (1234, (1, 2))
+
+
+class _Named:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+def _closing(name: str, closed: List[str]) -> Iterator[_Named]:
+    yield _Named(name)
+    closed.append(name)
+
+
+def _connecting(session_name: str, closed: List[str]) -> Iterator[_Named]:
+    yield from _closing(f"{session_name}:connection", closed)
+
+
+def _names(*resources: _Named) -> Tuple[str, ...]:
+    return tuple(resource.name for resource in resources)
+
+
+def test_function_scope_resources_are_collected_once_dependents_first() -> None:
+    closed: List[str] = []
+    session = providers.Resource(_closing, "session", closed, function_scope=True)
+    connection = providers.Resource(
+        _connecting,
+        session.provided.name,
+        closed,
+        function_scope=True,
+    )
+    global_resource = providers.Resource(_closing, "global", closed)
+    repository = providers.Factory(
+        _names,
+        session.cast,
+        connection.cast,
+        global_resource.cast,
+    )
+    service = providers.Factory(
+        lambda *values: values,
+        repository,
+        global_resource.provided.name,
+    )
+
+    resources = get_function_scope_resources([service, repository, session])
+
+    assert resources == (connection, session)
+
+    @inject
+    def _inner(value: Any = Provide[service]) -> Any:
+        return value
+
+    assert _inner() == (("session", "session:connection", "global"), "global")
+    assert closed == ["session:connection", "session"]
+
+
+def test_injection_without_function_scope_resources_skips_teardown(
+    container: Type[Container],
+) -> None:
+    @inject
+    def _inner(num: int = Provide[container.num]) -> int:
+        return num
+
+    # Module is shadowed by the inject function in the package namespace
+    with mock.patch.object(
+        sys.modules["injection.inject"],
+        "close_function_scope_resources_sync",
+    ) as close_resources:
+        assert _inner() == 1234
+
+    close_resources.assert_not_called()
+
+
+class _Config:
+    def __init__(self, name: str = "default") -> None:
+        self.name = name
+
+
+async def _async_client(config: _Config) -> Tuple[str, _Config]:
+    return "client", config
+
+
+class _DiamondContainer(DeclarativeContainer):
+    config = providers.Factory(_Config)
+    reader = providers.Transient(lambda config: config, config.cast)
+    client = providers.Coroutine(_async_client, config.cast)
+    service = providers.Factory(lambda a, b: (a, b), config.cast, reader.cast)
+
+
+def test_resolution_session_resolves_shared_providers_once() -> None:
+    @inject(resolution_session=True)
+    def _inner(
+        service: Tuple[_Config, _Config] = Provide[_DiamondContainer.service],
+        config: _Config = Provide[_DiamondContainer.config],
+    ) -> Tuple[_Config, ...]:
+        return (*service, config)
+
+    first, second, third = _inner()
+
+    assert first is second is third
+    assert _inner()[0] is not first
+
+    service = _DiamondContainer.service()
+    assert service[0] is not service[1]
+
+    with resolution_session():
+        service = _DiamondContainer.service()
+
+        assert service[0] is service[1] is _DiamondContainer.config()
+        assert _DiamondContainer.config(name="other") is not service[0]
+
+
+async def test_resolution_session_resolves_shared_providers_once_async() -> None:
+    @inject(resolution_session=True)
+    async def _inner(
+        client: Any = Provide[_DiamondContainer.client],
+        service: Tuple[_Config, _Config] = Provide[_DiamondContainer.service],
+    ) -> Tuple[_Config, ...]:
+        return (client[1], *service)
+
+    first, second, third = await _inner()
+
+    assert first is second is third
+
+
+async def _async_resource_value() -> AsyncIterator[int]:
+    yield 2
+
+
+async def test_async_injection_returns_created_objects_without_await() -> None:
+    async def _create(value: int) -> int:
+        return value
+
+    singleton = providers.Singleton(_create, 1)
+    resource = providers.Resource(_async_resource_value)
+
+    @inject
+    async def _inner(
+        a: Any = Provide[singleton],
+        b: int = Provide[resource],
+    ) -> Tuple[int, int]:
+        return a, b
+
+    assert await _inner() == (1, 2)
+
+    with mock.patch.object(
+        providers.Singleton,
+        "async_resolve",
+        side_effect=AssertionError,
+    ), mock.patch.object(
+        providers.Resource,
+        "async_resolve",
+        side_effect=AssertionError,
+    ):
+        assert await _inner() == (1, 2)
+
+        with singleton.override_context(3), resource.override_context(4, local=True):
+            assert await _inner() == (3, 4)
+
+    await resource.async_close()
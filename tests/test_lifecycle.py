@@ -0,0 +1,252 @@
+import asyncio
+import sqlite3
+import threading
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+
+from injection import DeclarativeContainer, providers
+from injection.exceptions import ResourcesShutdownError
+from injection.lifecycle import get_dependency_layers
+
+
+def _sync_resource() -> Iterator[str]:
+    yield "sync"
+
+
+async def _async_resource() -> AsyncIterator[str]:
+    yield "async"
+
+
+async def _async_resource_with(value: str) -> AsyncIterator[str]:
+    yield value
+
+
+def _join(*values: str) -> str:
+    return "-".join(values)
+
+
+def test_dependency_layers_pass_through_other_providers() -> None:
+    first = providers.Singleton(_join, "first")
+    second = providers.Singleton(_join, "second")
+    factory = providers.Factory(_join, first.cast)
+    third = providers.Singleton(_join, factory.cast, second.cast)
+
+    layers = get_dependency_layers([third, second, first])
+
+    assert layers == [[second, first], [third]]
+
+
+def test_dependency_layers_fail_on_circular_dependencies() -> None:
+    first = providers.Singleton(_join, "first")
+    second = providers.Singleton(_join, first.cast)
+    first._args = (second,)
+
+    with pytest.raises(RuntimeError, match="circular"):
+        get_dependency_layers([first, second])
+
+
+def test_warmup_initializes_independent_providers_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _wait(name: str) -> str:
+        # Both providers must be built at the same time to pass the barrier
+        barrier.wait()
+        return name
+
+    class _Container(DeclarativeContainer):
+        first = providers.Singleton(_wait, "first")
+        second = providers.Singleton(_wait, "second")
+        both = providers.Singleton(_join, first.cast, second.cast)
+        resource = providers.Resource(_sync_resource)
+        scoped_resource = providers.Resource(_sync_resource, function_scope=True)
+        async_resource = providers.Resource(_async_resource)
+        factory = providers.Factory(_join, "factory")
+
+    report = _Container.warmup()
+
+    assert report.layers == [["first", "resource", "second"], ["both"]]
+    assert set(report.durations) == {"both", "first", "resource", "second"}
+    assert report.total >= max(report.durations.values())
+    assert _Container.both._instance == "first-second"
+    assert _Container.resource.initialized
+    assert not _Container.scoped_resource.initialized
+    assert not _Container.async_resource.initialized
+
+    _Container.close_resources()
+
+
+async def test_warmup_async_initializes_sync_and_async_providers() -> None:
+    threads: List[str] = []
+
+    def _sync(value: str) -> str:
+        threads.append(threading.current_thread().name)
+        return value
+
+    class _Container(DeclarativeContainer):
+        async_resource = providers.Resource(_async_resource)
+        sync_singleton = providers.Singleton(_sync, "sync")
+        dependent = providers.Singleton(_join, async_resource.cast, "dependent")
+
+    report = await _Container.warmup_async(max_workers=2)
+
+    assert report.layers == [["async_resource", "sync_singleton"], ["dependent"]]
+    assert _Container.dependent._instance == "async-dependent"
+    assert _Container.sync_singleton._instance == "sync"
+    assert threads != [threading.current_thread().name]
+
+    await _Container.close_async_resources()
+
+
+async def test_init_all_resources_follows_dependencies_of_resources() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    events: List[str] = []
+
+    def _sync_waiting(name: str) -> Iterator[str]:
+        # Sync resources must be initialized at the same time to pass the barrier
+        barrier.wait()
+        events.append(name)
+        yield name
+
+    async def _async_dependent(*values: str) -> AsyncIterator[str]:
+        events.append("dependent")
+        yield _join(*values)
+
+    class _Container(DeclarativeContainer):
+        first = providers.Resource(_sync_waiting, "first")
+        second = providers.Resource(_sync_waiting, "second")
+        config = providers.Factory(_join, first.cast, "config")
+        dependent = providers.Resource(_async_dependent, config.cast, second.cast)
+
+    report = await _Container.init_all_resources(max_workers=2)
+
+    assert events[-1] == "dependent"
+    assert _Container.dependent.instance == "first-config-second"
+    assert set(report.durations) == {"dependent", "first", "second"}
+    assert report.critical_path[1:] == ["dependent"]
+    assert report.critical_path[0] in {"first", "second"}
+    assert report.critical_path_duration <= report.total
+
+    await _Container.close_all_resources()
+
+
+async def test_init_all_resources_raises_error_of_resource() -> None:
+    def _failing() -> Iterator[str]:
+        msg = "failed"
+        raise ValueError(msg)
+        yield "never"
+
+    class _Container(DeclarativeContainer):
+        failing = providers.Resource(_failing)
+        dependent = providers.Resource(_async_resource_with, failing.cast)
+
+    with pytest.raises(ValueError, match="failed"):
+        await _Container.init_all_resources()
+
+    assert not _Container.dependent.initialized
+
+
+async def test_close_all_resources_closes_dependents_first() -> None:
+    closed: List[str] = []
+
+    def _sync(name: str, *_: str) -> Iterator[str]:
+        yield name
+        closed.append(name)
+
+    async def _async(name: str, *_: str) -> AsyncIterator[str]:
+        yield name
+        closed.append(name)
+
+    class _Container(DeclarativeContainer):
+        engine = providers.Resource(_sync, "engine")
+        session = providers.Resource(_async, "session", engine.cast)
+        client = providers.Resource(_async, "client", session.cast)
+        not_initialized = providers.Resource(_sync, "not_initialized")
+
+    await _Container.client.async_resolve()
+    await _Container.close_all_resources()
+
+    assert closed == ["client", "session", "engine"]
+    assert not _Container.engine.initialized
+
+
+async def test_close_all_resources_aggregates_errors_and_timeouts() -> None:
+    closed: List[str] = []
+
+    async def _hung() -> AsyncIterator[str]:
+        yield "hung"
+        await asyncio.sleep(10)
+
+    def _failing() -> Iterator[str]:
+        yield "failing"
+        msg = "failed"
+        raise ValueError(msg)
+
+    def _dependency() -> Iterator[str]:
+        yield "dependency"
+        closed.append("dependency")
+
+    class _Container(DeclarativeContainer):
+        dependency = providers.Resource(_dependency)
+        dependent = providers.Resource(_async_resource_with, dependency.cast)
+        failing = providers.Resource(_failing)
+        slow = providers.Resource(_hung)
+
+    await _Container.init_all_resources()
+
+    with pytest.raises(ResourcesShutdownError) as error:
+        await _Container.close_all_resources(resource_timeout=0.05, timeout=1)
+
+    assert set(error.value.errors) == {"failing", "slow"}
+    assert isinstance(error.value.errors["failing"], ValueError)
+    assert isinstance(error.value.errors["slow"], asyncio.TimeoutError)
+    assert closed == ["dependency"]
+
+
+async def test_close_all_resources_closes_sync_resources_in_loop_thread() -> None:
+    def _connect() -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(":memory:")
+        yield connection
+        connection.close()
+
+    class _Container(DeclarativeContainer):
+        connection = providers.Resource(_connect)
+
+    _Container.init_resources()
+    await _Container.close_all_resources()
+
+    assert not _Container.connection.initialized
+
+
+async def test_close_all_resources_closes_sync_resources_in_threads() -> None:
+    threads: List[str] = []
+
+    def _sync() -> Iterator[str]:
+        yield "sync"
+        threads.append(threading.current_thread().name)
+
+    class _Container(DeclarativeContainer):
+        resource = providers.Resource(_sync)
+
+    _Container.init_resources()
+    await _Container.close_all_resources(max_workers=1)
+
+    assert threads != [threading.current_thread().name]
+    assert not _Container.resource.initialized
+
+
+async def test_init_all_resources_initializes_sync_resources_in_loop_thread() -> None:
+    def _connect() -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(":memory:")
+        yield connection
+        connection.close()
+
+    class _Container(DeclarativeContainer):
+        connection = providers.Resource(_connect)
+
+    report = await _Container.init_all_resources()
+
+    assert report.critical_path == ["connection"]
+    assert _Container.connection().execute("select 1").fetchone() == (1,)
+
+    await _Container.close_all_resources()
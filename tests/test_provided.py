@@ -1,7 +1,9 @@
-from typing import Type
+import copy
+from typing import Any, Dict, Type
 
 import pytest
 
+from injection import providers
 from injection.provided import ProvidedInstance
 from tests.container_objects import Container
 
@@ -10,7 +12,7 @@ def test_provider_resolving_fail_on_provided_without_any_attributes(
     container: Type[Container],
 ) -> None:
     provided = ProvidedInstance(container.settings)
-    assert len(provided._attrs) == 0
+    assert len(provided._steps) == 0
 
     with pytest.raises(Exception) as e:
         provided.get_value()
@@ -28,3 +30,85 @@ def test_provided_instance_attribute_call(container: Type[Container]) -> None:
 
     assert provided_property.call() == "Doing smth 2"
     assert provided_property.get_value()() == "Doing smth 2"
+
+
+def _pack(*values: Any) -> Any:
+    return values
+
+
+def test_provided_paths_are_immutable_and_interned(container: Type[Container]) -> None:
+    provided = container.settings.provided
+    nested = provided.nested_settings
+
+    assert container.settings.provided is provided
+    assert provided.nested_settings is nested
+    assert provided.redis_url is not nested
+    assert nested.some_const is provided.nested_settings.some_const
+
+    assert provided._steps == ()
+    assert nested.some_const._steps == (
+        ("attribute", "nested_settings"),
+        ("attribute", "some_const"),
+    )
+    assert provided.redis_url.get_value() == "redis://localhost"
+    assert nested.some_const.get_value() == 144
+
+
+def test_provided_path_with_items_and_calls() -> None:
+    def _config() -> Dict[str, Any]:
+        return {"databases": [{"dsn": "sqlite://"}], "tags": ["a", "b"]}
+
+    config = providers.Singleton(_config)
+    dsn = config.provided["databases"][0]["dsn"]
+    tags = config.provided.get("tags").copy()
+
+    assert config.provided["databases"] is config.provided["databases"]
+    assert dsn.upper().get_value() == "SQLITE://"
+    assert tags.get_value() == ["a", "b"]
+    assert tags.get_value() is not tags.get_value()
+    assert config.provided.get.call("tags") == ["a", "b"]
+
+    consumer = providers.Factory(_pack, dsn, tags)
+    assert consumer() == ("sqlite://", ["a", "b"])
+
+
+def test_provided_paths_of_equal_keys_and_call_arguments_are_not_shared() -> None:
+    def _values() -> Any:
+        return {1: "int", "1": "str"}
+
+    values = providers.Singleton(_values)
+    echo = providers.Singleton(lambda: _pack)
+
+    assert values.provided[1] is not values.provided[True]
+    assert values.provided["1"] is values.provided["1"]
+    assert values.provided[1.0]._steps == (("item", 1.0),)
+    assert values.provided["1"].get_value() == "str"
+
+    by_bool = echo.provided(True)  # noqa: FBT003
+    by_int = echo.provided(1)
+
+    assert by_bool is not by_int
+    assert by_bool.get_value()[0] is True
+    assert echo.provided._children is None
+
+
+async def test_provided_path_of_async_provider() -> None:
+    async def _create() -> Dict[str, int]:
+        return {"limit": 10}
+
+    settings = providers.Singleton(_create)
+    limit = settings.provided["limit"]
+    consumer = providers.Factory(_pack, limit)
+
+    assert consumer.should_be_async_resolved
+    assert await limit.async_get_value() == 10
+    assert await consumer.async_resolve() == (10,)
+
+
+def test_provided_path_skips_dunder_attributes(container: Type[Container]) -> None:
+    provided = container.settings.provided.nested_settings
+
+    with pytest.raises(AttributeError):
+        _ = provided.__wrapped__
+
+    assert copy.copy(provided).get_value() == container.settings().nested_settings
@@ -1,4 +1,18 @@
-from injection.providers import Coroutine, Factory, Object
+import asyncio
+import gc
+import threading
+from typing import Any, AsyncIterator, Tuple
+
+from injection import Provide
+from injection.providers import (
+    Coroutine,
+    Factory,
+    Object,
+    Resource,
+    Singleton,
+    Transient,
+)
+from injection.providers.base import _local_overrides_counts
 
 
 def test_has_async_dependencies_expect_false_without_dependencies() -> None:
@@ -60,3 +74,181 @@ def test_has_async_dependencies_expect_true_with_async_and_sync_dependencies() -
     )
 
     assert provider.has_async_dependencies()
+
+
+async def test_should_be_async_resolved_with_transitive_async_dependency() -> None:
+    async def _connect() -> AsyncIterator[str]:
+        yield "connection"
+
+    def _pair(first: Any, second: Any) -> Tuple[Any, Any]:
+        return first, second
+
+    connection = Resource(_connect)
+    session = Factory(_pair, connection.cast, Object(1).cast)
+    service = Factory(_pair, session.cast, second=Object(2).cast)
+    repository = Factory(_pair, first="repository", second=service.cast)
+
+    assert service.should_be_async_resolved
+    assert repository.has_async_dependencies()
+    assert repository.should_be_async_resolved
+    assert not Factory(_pair, "value", Object(3).cast).should_be_async_resolved
+
+    assert await repository.async_resolve() == (
+        "repository",
+        (("connection", 1), 2),
+    )
+
+
+def test_requires_async_is_cached_and_invalidated_on_override() -> None:
+    async def _async_factory() -> int:
+        return 5
+
+    coroutine = Coroutine(_async_factory)
+    provider = Factory(lambda value: value, coroutine.cast)
+
+    assert provider.requires_async
+    assert provider._requires_async is True
+
+    with coroutine.override_context(5):
+        assert provider._requires_async is None
+        assert provider.requires_async
+
+    assert provider._requires_async is None
+
+
+def test_providers_and_markers_have_no_instance_dict() -> None:
+    def _resource() -> Any:
+        yield 1
+
+    dependency = Object(1)
+    objects = [
+        dependency,
+        Factory(dict),
+        Transient(dict),
+        Singleton(dict),
+        Resource(_resource),
+        Coroutine(_resource),
+        Provide(dependency),
+        dependency.provided.real,
+    ]
+
+    for obj in objects:
+        assert not hasattr(obj, "__dict__")
+
+    assert dependency._mocks == ()
+
+    with dependency.override_context(2):
+        assert dependency() == 2
+
+    assert dependency._mocks == ()
+
+
+def test_dependents_are_referenced_weakly() -> None:
+    dependency = Object(1)
+    dependent = Factory(lambda a, b: a + b, dependency.cast, dependency.cast)
+
+    assert dependency.get_dependents() == [dependent]
+
+    del dependent
+    gc.collect()
+
+    assert dependency.get_dependents() == []
+
+
+def test_single_dependent_is_stored_without_list() -> None:
+    dependency = Object(1)
+    first = Factory(str, dependency.cast)
+
+    assert not isinstance(dependency._dependents, list)
+
+    second = Factory(str, dependency.cast)
+
+    assert dependency.get_dependents() == [first, second]
+
+    del first, second
+    gc.collect()
+    third = Factory(str, dependency.cast)
+
+    assert dependency.get_dependents() == [third]
+
+
+async def test_override_swaps_active_resolvers() -> None:
+    provider = Factory(lambda: "original")
+    original_resolver = provider._resolver
+
+    with provider.override_context("first"):
+        assert provider._resolver is not original_resolver
+
+        with provider.override_context("second"):
+            assert provider() == "second"
+            assert await provider.async_resolve() == "second"
+
+        assert provider() == "first"
+        assert await provider.async_resolve() == "first"
+
+    assert provider._resolver is original_resolver
+    assert provider() == "original"
+    assert await provider.async_resolve() == "original"
+
+
+async def test_local_override_is_visible_only_in_its_task() -> None:
+    dependency = Object(1)
+    provider = Factory(lambda value: value * 10, dependency.cast)
+    overridden = asyncio.Event()
+    checked = asyncio.Event()
+
+    async def _override() -> int:
+        with dependency.override_context(2, local=True):
+            overridden.set()
+            await checked.wait()
+            return provider()
+
+    async def _check() -> int:
+        await overridden.wait()
+        value = provider()
+        checked.set()
+        return value
+
+    overridden_value, value = await asyncio.gather(_override(), _check())
+
+    assert (overridden_value, value) == (20, 10)
+    assert dependency not in _local_overrides_counts
+    assert dependency._resolver is type(dependency)._resolve
+
+
+def test_local_override_is_visible_only_in_its_thread() -> None:
+    dependency = Object(1)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def _run(mock: int) -> None:
+        with dependency.override_context(mock, local=True):
+            barrier.wait()
+            results[mock] = dependency()
+            barrier.wait()
+
+    threads = [threading.Thread(target=_run, args=(mock,)) for mock in (2, 3)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {2: 2, 3: 3}
+    assert dependency() == 1
+
+
+async def test_local_override_has_priority_over_global_one() -> None:
+    dependency = Object(1)
+
+    with dependency.override_context(2):
+        with dependency.override_context(3, local=True):
+            with dependency.override_context(4, local=True):
+                assert dependency() == 4
+                assert await dependency.async_resolve() == 4
+
+            assert dependency() == 3
+
+        assert dependency() == 2
+
+    assert dependency() == 1
@@ -100,3 +100,10 @@ async def test_coroutine_provider_overriding(container: Type[Container]) -> None
         value = await _inner()
 
     assert value == "mock"
+
+
+def test_coroutine_provider_overridden_is_resolved_synchronously(
+    container: Type[Container],
+) -> None:
+    with container.coroutine_provider.override_context("mock"):
+        assert container.coroutine_provider() == "mock"  # type: ignore[comparison-overlap]
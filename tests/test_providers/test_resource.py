@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from types import TracebackType
 from typing import (
     Any,
@@ -5,6 +9,7 @@ from typing import (
     AsyncIterator,
     ContextManager,
     Iterator,
+    List,
     Optional,
     Type,
 )
@@ -464,3 +469,88 @@ async def test_related_resource_providers_closing_async() -> None:
 
     assert not _Container.unrelated_resource.initialized
     assert _Container.unrelated_resource.instance is None
+
+
+async def test_resource_concurrent_async_initialization_enters_context_once() -> None:
+    entered = Mock()
+
+    async def _connect() -> AsyncIterator[object]:
+        entered()
+        await asyncio.sleep(0)
+        yield object()
+
+    provider = providers.Resource(_connect)
+    instances = await asyncio.gather(*[provider.async_resolve() for _ in range(3)])
+
+    entered.assert_called_once()
+    assert provider.initialized
+    assert all(instance is provider.instance for instance in instances)
+    await provider.async_close()
+
+
+def test_resource_concurrent_initialization_in_threads_enters_context_once() -> None:
+    entered = Mock()
+
+    def _connect() -> Iterator[object]:
+        entered()
+        time.sleep(0.01)
+        yield object()
+
+    provider = providers.Resource(_connect)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: provider(), range(8)))
+
+    entered.assert_called_once()
+    assert all(instance is provider.instance for instance in instances)
+    provider.close()
+
+
+async def test_function_scope_resource_is_isolated_between_concurrent_calls() -> None:
+    closed: List[int] = []
+
+    async def _session() -> AsyncIterator[List[int]]:
+        session: List[int] = []
+        yield session
+        closed.append(session[0])
+
+    class _Container(DeclarativeContainer):
+        session = providers.Resource(_session, function_scope=True)
+
+    @inject
+    async def _handler(
+        number: int,
+        session: List[int] = Provide[_Container.session],
+    ) -> List[int]:
+        session.append(number)
+        await asyncio.sleep(0)
+        assert _Container.session.instance is session
+        return session
+
+    sessions = await asyncio.gather(*[_handler(number) for number in range(3)])
+
+    assert sessions == [[0], [1], [2]]
+    assert sorted(closed) == [0, 1, 2]
+    assert not _Container.session.initialized
+
+
+def test_function_scope_resource_is_isolated_between_threads() -> None:
+    barrier = threading.Barrier(4)
+
+    def _session() -> Iterator[object]:
+        yield object()
+
+    class _Container(DeclarativeContainer):
+        session = providers.Resource(_session, function_scope=True)
+
+    @inject
+    def _handler(_: int, session: object = Provide[_Container.session]) -> object:
+        barrier.wait(timeout=5)
+        assert _Container.session.instance is session
+        return session
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sessions = list(executor.map(_handler, range(4)))
+
+    assert len({id(session) for session in sessions}) == 4
+    assert not _Container.session.initialized
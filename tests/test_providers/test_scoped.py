@@ -0,0 +1,86 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Tuple
+
+import pytest
+
+from injection import DeclarativeContainer, Provide, inject, providers, request_scope
+
+
+@dataclass
+class UnitOfWork:
+    tenant: str
+    changes: list = field(default_factory=list)  # type: ignore[type-arg]
+
+
+@dataclass
+class Repository:
+    uow: UnitOfWork
+
+
+async def _create_uow(tenant: str) -> UnitOfWork:
+    await asyncio.sleep(0)
+    return UnitOfWork(tenant)
+
+
+class Container(DeclarativeContainer):
+    uow = providers.Scoped(UnitOfWork, tenant="tenant")
+    async_uow = providers.Scoped(_create_uow, tenant="async")
+    repository = providers.Factory(Repository, uow=uow.cast)
+
+
+def test_scoped_resolving_outside_of_scope_expect_error() -> None:
+    with pytest.raises(RuntimeError, match="request scope"):
+        Container.uow()
+
+
+def test_scoped_object_created_once_per_scope() -> None:
+    with request_scope():
+        uow = Container.uow()
+
+        assert Container.uow() is uow
+        assert Container.repository().uow is uow
+
+        with request_scope():
+            assert Container.uow() is not uow
+
+        assert Container.uow() is uow
+
+    with request_scope():
+        assert Container.uow() is not uow
+
+
+def test_scoped_object_shared_by_nested_injected_calls() -> None:
+    @inject
+    def _save(
+        change: str,
+        repository: Repository = Provide[Container.repository],
+    ) -> UnitOfWork:
+        repository.uow.changes.append(change)
+        return repository.uow
+
+    @inject
+    def _handler(uow: UnitOfWork = Provide[Container.uow]) -> UnitOfWork:
+        assert _save("first") is uow
+        assert _save("second") is uow
+        return uow
+
+    uow = _handler()
+
+    assert uow.changes == ["first", "second"]
+    assert _handler() is not uow
+
+
+async def test_scoped_objects_isolated_between_concurrent_requests() -> None:
+    @inject
+    async def _handler(
+        uow: Any = Provide[Container.async_uow],
+    ) -> Tuple[UnitOfWork, Any]:
+        await asyncio.sleep(0)
+        return uow, await Container.async_uow.async_resolve()
+
+    results = await asyncio.gather(*[_handler() for _ in range(3)])
+
+    assert all(first is second for first, second in results)
+    assert len({id(first) for first, _ in results}) == 3
+    assert results[0][0].tenant == "async"
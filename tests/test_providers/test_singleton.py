@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List
 
@@ -158,3 +162,72 @@ def test_singleton_overriding_with_reset_singletons() -> None:
 
     test_case_1_fixed()
     test_case_2_fixed()
+
+
+async def test_singleton_concurrent_async_resolving_creates_object_once() -> None:
+    calls: List[str] = []
+
+    async def _create(field1: str) -> SomeClass:
+        calls.append(field1)
+        await asyncio.sleep(0)
+
+        if len(calls) == 1:
+            msg = "connection refused"
+            raise ConnectionError(msg)
+
+        return SomeClass(field1=field1, field2=len(calls))
+
+    provider = providers.Singleton(_create, field1="pool")
+
+    results = await asyncio.gather(
+        *[provider.async_resolve() for _ in range(5)],
+        return_exceptions=True,
+    )
+
+    assert calls == ["pool"]
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert provider._pending == {}
+
+    instances = await asyncio.gather(*[provider.async_resolve() for _ in range(5)])
+
+    assert calls == ["pool", "pool"]
+    assert all(instance is instances[0] for instance in instances)
+    assert instances[0] == SomeClass(field1="pool", field2=2)  # type: ignore[comparison-overlap]
+
+
+def test_singleton_concurrent_async_resolving_in_event_loops_of_threads() -> None:
+    first_started = threading.Event()
+
+    async def _create() -> SomeClass:
+        first_started.set()
+        await asyncio.sleep(0.05)
+        return SomeClass(field1="client", field2=threading.get_ident())
+
+    provider = providers.Singleton(_create)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(asyncio.run, provider.async_resolve())
+        assert first_started.wait(timeout=1)
+        second = executor.submit(asyncio.run, provider.async_resolve())
+
+        instances = [first.result(timeout=1), second.result(timeout=1)]
+
+    assert all(isinstance(instance, SomeClass) for instance in instances)
+    assert provider._pending == {}
+
+
+def test_singleton_concurrent_resolving_in_threads_creates_object_once() -> None:
+    calls: List[int] = []
+
+    def _create() -> SomeClass:
+        calls.append(1)
+        time.sleep(0.01)
+        return SomeClass(field1="engine", field2=len(calls))
+
+    provider = providers.Singleton(_create)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: provider(), range(8)))
+
+    assert len(calls) == 1
+    assert all(instance is instances[0] for instance in instances)
@@ -0,0 +1,315 @@
+import asyncio
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, AsyncIterator, Callable, List
+from unittest import mock
+
+import pytest
+
+from injection import providers
+from injection.providers.base_factory import BaseFactoryProvider
+from injection.resolving import ResolutionPlan
+
+
+@dataclass
+class SomeClass:
+    a: Any
+    b: Any
+    c: Any = None
+    d: Any = None
+
+
+def test_resolution_plan_binds_constants_to_factory() -> None:
+    dependency = providers.Object(5)
+    plan = ResolutionPlan(SomeClass, (1, dependency, 3), {"d": 4})
+
+    assert isinstance(plan.factory, partial)
+    assert plan.factory.args == (1,)
+    assert plan.factory.keywords == {"d": 4}
+    assert [resolver for _, resolver, _ in plan.args] == [dependency, None]
+    assert plan.kwargs == ()
+
+    assert plan.resolve((), {}) == SomeClass(1, 5, 3, 4)
+
+
+def test_resolution_plan_without_constants_keeps_factory() -> None:
+    plan = ResolutionPlan(SomeClass, (), {"b": providers.Object(1)})
+
+    assert plan.factory is SomeClass
+    assert plan.resolve((2,), {}) == SomeClass(2, 1)
+
+
+def test_resolution_plan_call_kwargs_have_priority() -> None:
+    plan = ResolutionPlan(
+        SomeClass,
+        (),
+        {"a": 1, "b": providers.Object(2)},
+    )
+
+    assert plan.resolve((), {"a": -1, "b": -2}) == SomeClass(-1, -2)
+
+
+def test_factory_provider_builds_plan_once() -> None:
+    provider = providers.Factory(SomeClass, a=1, b=providers.Object(2))
+
+    assert provider() == SomeClass(1, 2)
+    plan = provider._plan
+    assert plan is not None
+
+    provider()
+    assert provider._plan is plan
+
+
+def test_factory_provider_plan_invalidated_on_dependency_override() -> None:
+    dependency = providers.Object(2)
+    provider = providers.Factory(SomeClass, a=1, b=dependency)
+    _ = provider()
+
+    assert provider._plan is not None
+    assert provider in dependency.get_dependents()
+
+    with dependency.override_context(3):
+        assert provider._plan is None
+        assert provider() == SomeClass(1, 3)
+
+    assert provider._plan is None
+    assert provider() == SomeClass(1, 2)
+
+
+def test_resolution_plan_is_specialized_for_shape_of_dependencies() -> None:
+    dependency = providers.Object(5)
+
+    assert ResolutionPlan(SomeClass, (1, 2), {}).build() == SomeClass(1, 2)
+    assert ResolutionPlan(SomeClass, (dependency,), {"b": 1}).build() == SomeClass(5, 1)
+    assert ResolutionPlan(SomeClass, (1,), {"b": dependency}).build() == SomeClass(1, 5)
+    assert ResolutionPlan(
+        SomeClass,
+        (dependency, 2, dependency),
+        {"d": dependency},
+    ).build() == SomeClass(5, 2, 5, 5)
+    assert ResolutionPlan(
+        SomeClass,
+        (dependency,),
+        {"b": dependency, "c": 3, "d": dependency},
+    ).build() == SomeClass(5, 5, 3, 5)
+    assert ResolutionPlan(
+        lambda **kwargs: kwargs,
+        (),
+        {"not identifier": dependency, "class": dependency, "b": 1},
+    ).build() == {"not identifier": 5, "class": 5, "b": 1}
+
+
+def _get_peak_memory(resolve: Callable[[], Any]) -> int:
+    """
+    Peak of memory allocated by warm resolving. CPython doesn't count allocations
+    which are freed before the call returns, so the peak stands in for their count:
+    list and dict of arguments of the generic path are alive at the same time.
+    """
+    resolve()
+    tracemalloc.start()
+
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        for _ in range(100):
+            resolve()
+
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - base
+
+
+def _build(a: int, b: int, c: int = 0, d: int = 0) -> None:
+    _ = a, b, c, d
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason="tracemalloc.reset_peak")
+@pytest.mark.parametrize(
+    "provider",
+    [
+        providers.Factory(_build, providers.Object(1).cast, providers.Object(2).cast),
+        providers.Factory(
+            _build,
+            providers.Factory(int).cast,
+            providers.Object(2).cast,
+        ),
+        providers.Factory(_build, 1, b=providers.Factory(int).cast),
+        providers.Factory(
+            _build,
+            providers.Factory(int).cast,
+            b=providers.Factory(int).cast,
+            c=3,
+            d=providers.Object(4).cast,
+        ),
+    ],
+    ids=["positional", "factory", "keyword", "keywords_with_constants"],
+)
+def test_warm_resolution_does_not_allocate_arguments(
+    provider: BaseFactoryProvider[None],
+) -> None:
+    plan = provider._get_plan()
+
+    specialized_peak = _get_peak_memory(provider)
+    generic_peak = _get_peak_memory(lambda: plan.resolve((), {}))
+
+    # List and dict of arguments are not created on each call
+    assert specialized_peak < generic_peak
+    assert specialized_peak <= 128
+
+
+def test_resolved_singleton_is_embedded_into_plan_of_dependent() -> None:
+    singleton: providers.Singleton[List[str]] = providers.Singleton(list)
+    provider = providers.Factory(SomeClass, a=1, b=singleton)
+    _ = provider()
+    instance = singleton()
+
+    assert provider._plan is None
+    assert provider() == SomeClass(1, instance)
+    assert provider._plan is not None
+    assert provider._plan.factory.keywords == {"a": 1, "b": instance}
+    assert provider._plan.kwargs == ()
+
+
+def test_embedded_singleton_is_dropped_on_reset_and_override() -> None:
+    singleton: providers.Singleton[List[str]] = providers.Singleton(list)
+    provider = providers.Factory(SomeClass, a=singleton, b=None)
+    instance = singleton()
+
+    assert provider().a is instance
+
+    with singleton.override_context(["mock"]):
+        assert provider().a == ["mock"]
+
+        with singleton.override_context(["local"], local=True):
+            assert provider().a == ["local"]
+
+    assert provider().a is instance
+
+    singleton.reset()
+
+    assert provider._plan is None
+    assert provider().a is not instance
+    assert provider().a is singleton()
+
+
+def test_plan_invalidated_while_built_is_not_stored() -> None:
+    singleton: providers.Singleton[List[str]] = providers.Singleton(list)
+    provider = providers.Factory(SomeClass, a=singleton, b=None)
+    instance = singleton()
+    create_plan = providers.Factory._create_plan
+
+    def _create_plan_with_reset(self: providers.Factory[Any]) -> ResolutionPlan:
+        plan = create_plan(self)
+        # Reset in another thread between building and storing of the plan
+        singleton.reset()
+        return plan
+
+    with mock.patch.object(providers.Factory, "_create_plan", _create_plan_with_reset):
+        assert provider().a is instance
+
+    assert provider._plan is None
+    assert provider().a is singleton()
+    assert provider().a is not instance
+
+
+def _connection_factory(events: List[str]) -> Callable[[str], AsyncIterator[str]]:
+    async def _connect(name: str) -> AsyncIterator[str]:
+        events.append(f"open {name}")
+        await asyncio.sleep(0)
+        events.append(f"opened {name}")
+        yield name
+
+    return _connect
+
+
+async def test_resolution_plan_resolves_independent_dependencies_concurrently() -> None:
+    events: List[str] = []
+    connect = _connection_factory(events)
+    first = providers.Resource(connect, "first")
+    second = providers.Resource(connect, "second")
+    third = providers.Resource(connect, "third")
+    plan = ResolutionPlan(
+        SomeClass,
+        (first, providers.Object(0)),
+        {"c": third, "d": second},
+        concurrent=True,
+    )
+
+    assert plan.concurrent
+    assert await plan.async_resolve((), {}) == SomeClass("first", 0, "third", "second")
+    assert events == [
+        "open first",
+        "open third",
+        "open second",
+        "opened first",
+        "opened third",
+        "opened second",
+    ]
+
+    events.clear()
+    assert await plan.async_resolve((), {}) == SomeClass("first", 0, "third", "second")
+    assert events == []
+
+
+async def test_async_dependencies_are_resolved_concurrently_only_when_opted_in() -> (
+    None
+):
+    events: List[str] = []
+    connect = _connection_factory(events)
+    first = providers.Resource(connect, "first")
+    second = providers.Resource(connect, "second")
+    provider = providers.Factory(SomeClass, first, second)
+
+    assert await provider.async_resolve() == SomeClass("first", "second")
+    assert events == ["open first", "opened first", "open second", "opened second"]
+
+    await first.async_close()
+    await second.async_close()
+    events.clear()
+
+    assert provider.resolve_concurrently() is provider
+    assert await provider.async_resolve() == SomeClass("first", "second")
+    assert events == ["open first", "open second", "opened first", "opened second"]
+
+
+async def test_resolution_plan_resolves_shared_dependencies_sequentially() -> None:
+    events: List[str] = []
+    connect = _connection_factory(events)
+    connection = providers.Resource(connect, "connection")
+    first = providers.Factory(lambda value: f"first {value}", connection)
+    second = providers.Factory(lambda value: f"second {value}", connection)
+    plan = ResolutionPlan(SomeClass, (first, second), {}, concurrent=True)
+
+    assert not plan.concurrent
+    assert await plan.async_resolve((), {}) == SomeClass(
+        "first connection",
+        "second connection",
+    )
+    assert events == ["open connection", "opened connection"]
+
+
+async def test_resolution_plan_raises_first_error_of_concurrent_dependencies() -> None:
+    async def _fail(message: str) -> str:
+        await asyncio.sleep(0)
+        raise ValueError(message)
+
+    events: List[str] = []
+    resource = providers.Resource(_connection_factory(events), "resource")
+    plan = ResolutionPlan(
+        SomeClass,
+        (resource, providers.Coroutine(_fail, "first")),
+        {"c": providers.Coroutine(_fail, "second")},
+        concurrent=True,
+    )
+
+    assert plan.concurrent
+
+    with pytest.raises(ValueError, match="first"):
+        await plan.async_resolve((), {})
+
+    assert resource.initialized